@@ -4,10 +4,147 @@ NVMe Stress Test Report Generator
 Parses NVMe test logs and creates a modern HTML report
 """
 
+import functools
+import mmap
 import re
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
 from pathlib import Path
-from datetime import datetime
+from string import Template
+
+# Converters for SMART values; each returns None when the value doesn't
+# have the expected shape
+def _text(value):
+    """Plain value, unchanged"""
+    return value or None
+
+
+def _bracketed(value):
+    """'2,000,398,934,016 [2.00 TB]' -> '2.00 TB'"""
+    head, sep, tail = value.partition('[')
+    inner = tail.partition(']')[0].strip()
+    return inner if sep and inner else None
+
+
+def _celsius(value):
+    """'38 Celsius' -> '38'"""
+    number, _, unit = value.partition(' ')
+    return number if number.isdigit() and unit.strip() == 'Celsius' else None
+
+
+def _percent(value):
+    """'3%' -> '3'"""
+    return value.partition('%')[0].strip() or None
+
+
+def _count(value):
+    """'1,024' -> 1024"""
+    value = value.replace(',', '')
+    return int(value) if value.isdigit() else None
+
+
+# SMART "label: value" lines are located with a plain substring search and
+# split with str.partition; no regex engine involved. Each entry is
+# (data key, label, converter for the stripped remainder of the line).
+
+# Drive specs and the SMART dump taken before the test
+_SMART_FIELDS = (
+    ('model', b'Model Number:', _text),
+    ('serial', b'Serial Number:', _text),
+    ('firmware', b'Firmware Version:', _text),
+    ('nvme_version', b'NVMe Version:', _text),
+    ('health_status', b'SMART overall-health self-assessment test result:', _text),
+    ('capacity', b'Total NVM Capacity:', _bracketed),
+    ('temp_before', b'Temperature:', _celsius),
+    ('percentage_used', b'Percentage Used:', _percent),
+    ('errors', b'Error Information Log Entries:', _count),
+)
+
+# SMART dump taken after the test
+_AFTER_FIELDS = (
+    ('temp_after', b'Temperature:', _celsius),
+    ('data_read', b'Data Units Read:', _bracketed),
+    ('data_written', b'Data Units Written:', _bracketed),
+)
+
+_TEMP_SENSORS = re.compile(rb'Temperature Sensor (\d+):\s+(\d+)\s+Celsius')
+
+# FIO output tokens, consumed in order by _fio_metrics(). "Run status group N"
+# headers switch the group that the following READ/WRITE summaries belong to;
+# per-job lines read "IOPS=<value>, BW=...".
+_FIO_TOKENS = re.compile(
+    rb'Run status group (?P<group>\d+)'
+    rb'|(?P<checkpoint_job>ai_model_checkpoint)'
+    rb'|READ:\s+bw=(?P<group_read_bw>\d+)MiB/s'
+    rb'|WRITE:\s+bw=(?P<group_write_bw>\d+)MiB/s'
+    rb'|read: IOPS=(?P<read_iops>[\d.]+[kM]?),'
+    rb'|write: IOPS=(?P<write_iops>[\d.]+[kM]?)'
+)
+
+
+def _decode(value):
+    """Decode a captured byte span from the log"""
+    return value.decode('utf-8', 'ignore').strip()
+
+
+def _line_value(content, label, start, end):
+    """Return the stripped remainder of the first line containing `label` in [start, end), or None"""
+    start = content.find(label, start, end)
+    if start < 0:
+        return None
+    start += len(label)
+    end = content.find(b'\n', start)
+    if end < 0:
+        end = len(content)
+    return _decode(content[start:end])
+
+
+def _fio_metrics(content):
+    """Extract FIO bandwidth/IOPS figures in a single pass over the log"""
+    found = {}
+    group = None
+    checkpoint_job = False
+    for match in _FIO_TOKENS.finditer(content):
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'group':
+            group = int(value)
+        elif kind == 'checkpoint_job':
+            checkpoint_job = True
+        elif kind == 'group_read_bw':
+            # AI Data Load (randrw) - Group 0
+            if group == 0:
+                found.setdefault('read_bw', value)
+        elif kind == 'group_write_bw':
+            # AI Model Checkpoint (write) - Group 1
+            if group == 0:
+                found.setdefault('write_bw', value)
+            elif group == 1:
+                found.setdefault('checkpoint_write_bw', value)
+        elif kind == 'read_iops':
+            found.setdefault('read_iops', value)
+        else:
+            found.setdefault('write_iops', value)
+            if checkpoint_job:
+                found.setdefault('checkpoint_write_iops', value.rstrip(b'kM').split(b'.')[0])
+    
+    return {key: f"{_decode(value)} MiB/s" if key.endswith('_bw') else _decode(value)
+            for key, value in found.items()}
+
+
+def _read_fields(fields, content, start, end):
+    """Return {data key: value} for each field found in [start, end)"""
+    found = {}
+    for key, label, convert in fields:
+        value = _line_value(content, label, start, end)
+        if value is not None:
+            value = convert(value)
+            if value is not None:
+                found[key] = value
+    return found
+
 
 class NVMeLogParser:
     def __init__(self, log_file):
@@ -42,373 +179,314 @@ class NVMeLogParser:
     def parse(self):
         """Parse the log file and extract relevant information"""
         try:
-            with open(self.log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            # Extract drive specs
-            model_match = re.search(r'Model Number:\s+(.+)', content)
-            if model_match:
-                self.data['model'] = model_match.group(1).strip()
-            
-            serial_match = re.search(r'Serial Number:\s+(.+)', content)
-            if serial_match:
-                self.data['serial'] = serial_match.group(1).strip()
-            
-            firmware_match = re.search(r'Firmware Version:\s+(.+)', content)
-            if firmware_match:
-                self.data['firmware'] = firmware_match.group(1).strip()
-            
-            capacity_match = re.search(r'Total NVM Capacity:\s+[\d,]+\s+\[(.+?)\]', content)
-            if capacity_match:
-                self.data['capacity'] = capacity_match.group(1).strip()
-            
-            nvme_version_match = re.search(r'NVMe Version:\s+(.+)', content)
-            if nvme_version_match:
-                self.data['nvme_version'] = nvme_version_match.group(1).strip()
-            
-            # Extract SMART data before test
-            health_match = re.search(r'SMART overall-health self-assessment test result:\s+(.+)', content)
-            if health_match:
-                self.data['health_status'] = health_match.group(1).strip()
-            
-            # Temperature before test (first occurrence)
-            temp_before_match = re.search(r'Temperature:\s+(\d+)\s+Celsius', content)
-            if temp_before_match:
-                self.data['temp_before'] = temp_before_match.group(1)
-            
-            # Extract percentage used
-            percentage_match = re.search(r'Percentage Used:\s+(.+?)%', content)
-            if percentage_match:
-                self.data['percentage_used'] = percentage_match.group(1).strip()
-            
-            # Extract post-test SMART data (from the end of file)
-            # Split on "after test" to get the final SMART data
-            after_test_sections = content.split('after test')
-            if len(after_test_sections) > 1:
-                after_section = after_test_sections[-1]
-                
-                temp_after_match = re.search(r'Temperature:\s+(\d+)\s+Celsius', after_section)
-                if temp_after_match:
-                    self.data['temp_after'] = temp_after_match.group(1)
-                
-                # Extract all temperature sensors
-                temp_sensors = re.findall(r'Temperature Sensor (\d+):\s+(\d+)\s+Celsius', after_section)
-                self.data['temp_sensors_after'] = [(f"Sensor {num}", temp) for num, temp in temp_sensors]
-                
-                data_read_match = re.search(r'Data Units Read:\s+([\d,]+)\s+\[(.+?)\]', after_section)
-                if data_read_match:
-                    self.data['data_read'] = data_read_match.group(2).strip()
-                
-                data_written_match = re.search(r'Data Units Written:\s+([\d,]+)\s+\[(.+?)\]', after_section)
-                if data_written_match:
-                    self.data['data_written'] = data_written_match.group(2).strip()
-            
-            # Extract FIO performance metrics
-            # AI Data Load (randrw) - Group 0
-            read_perf_match = re.search(r'Run status group 0.*?READ:\s+bw=(\d+)MiB/s.*?io=(.+?)\(', content, re.DOTALL)
-            if read_perf_match:
-                self.data['read_bw'] = f"{read_perf_match.group(1)} MiB/s"
-            
-            # Extract read IOPS from detailed section
-            read_iops_match = re.search(r'read: IOPS=([\d.]+[kM]?),', content)
-            if read_iops_match:
-                self.data['read_iops'] = read_iops_match.group(1)
-            
-            write_perf_match = re.search(r'Run status group 0.*?WRITE:\s+bw=(\d+)MiB/s', content, re.DOTALL)
-            if write_perf_match:
-                self.data['write_bw'] = f"{write_perf_match.group(1)} MiB/s"
-            
-            # Extract write IOPS from detailed section
-            write_iops_match = re.search(r'write: IOPS=([\d.]+[kM]?),', content)
-            if write_iops_match:
-                self.data['write_iops'] = write_iops_match.group(1)
-            
-            # AI Model Checkpoint (write) - Group 1
-            checkpoint_match = re.search(r'Run status group 1.*?WRITE:\s+bw=(\d+)MiB/s', content, re.DOTALL)
-            if checkpoint_match:
-                self.data['checkpoint_write_bw'] = f"{checkpoint_match.group(1)} MiB/s"
-            
-            checkpoint_iops_match = re.search(r'ai_model_checkpoint.*?write: IOPS=(\d+)', content, re.DOTALL)
-            if checkpoint_iops_match:
-                self.data['checkpoint_write_iops'] = checkpoint_iops_match.group(1)
-            
-            # Check for errors
-            error_entries_match = re.search(r'Error Information Log Entries:\s+(\d+)', content)
-            if error_entries_match:
-                self.data['errors'] = int(error_entries_match.group(1))
-            
+            # The log is memory-mapped and scanned as bytes; only the
+            # captured values are decoded
+            with open(self.log_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                        self._extract(content)
         except Exception as e:
             print(f"Error parsing {self.log_file}: {e}")
         
         return self.data
+    
+    def _extract(self, content):
+        """Fill self.data from the mapped log contents"""
+        # The log holds a SMART dump before the test and one "after test";
+        # pre-test fields are read up to the first marker, post-test fields
+        # after the last one
+        before_end = content.find(b'after test')
+        after_start = content.rfind(b'after test')
+        if before_end < 0:
+            before_end = len(content)
+        
+        # Extract drive specs and pre-test SMART data
+        self.data.update(_read_fields(_SMART_FIELDS, content, 0, before_end))
+        
+        # Extract post-test SMART data
+        if after_start >= 0:
+            after_start += len(b'after test')
+            
+            self.data.update(_read_fields(_AFTER_FIELDS, content, after_start, len(content)))
+            
+            # Extract all temperature sensors
+            temp_sensors = _TEMP_SENSORS.findall(content, after_start)
+            # Stored as raw (number, temp) pairs; the renderers add the "Sensor" label
+            self.data['temp_sensors_after'] = [(_decode(num), _decode(temp)) for num, temp in temp_sensors]
+        
+        # Extract FIO performance metrics
+        self.data.update(_fio_metrics(content))
+
+
+# Link speed as reported by sysfs (first two words) -> PCIe generation
+_PCIE_GENERATIONS = {
+    '32.0 GT/s': 'PCIe 5.0', '32 GT/s': 'PCIe 5.0',
+    '16.0 GT/s': 'PCIe 4.0', '16 GT/s': 'PCIe 4.0',
+    '8.0 GT/s': 'PCIe 3.0', '8 GT/s': 'PCIe 3.0',
+}
+
+
+def _read_first_sysfs(attribute):
+    """Return the stripped value of `attribute` for the first NVMe controller, or None"""
+    paths = sorted(Path('/sys/class/nvme').glob(f'nvme*/device/{attribute}'))
+    if not paths:
+        return None
+    return paths[0].read_text().strip()
 
 
+@functools.lru_cache(maxsize=1)
 def get_pcie_info():
-    """Get PCIe generation and link width information"""
+    """Get PCIe generation and link width information (cached; links don't change mid-run)"""
     try:
-        import subprocess
-        speed = subprocess.check_output("cat /sys/class/nvme/nvme*/device/current_link_speed 2>/dev/null | head -1", shell=True).decode().strip()
-        width = subprocess.check_output("cat /sys/class/nvme/nvme*/device/current_link_width 2>/dev/null | head -1", shell=True).decode().strip()
-        
-        # Determine PCIe generation
-        pcie_gen = "Unknown"
-        if "32.0 GT/s" in speed or "32 GT/s" in speed:
-            pcie_gen = "PCIe 5.0"
-        elif "16.0 GT/s" in speed or "16 GT/s" in speed:
-            pcie_gen = "PCIe 4.0"
-        elif "8.0 GT/s" in speed or "8 GT/s" in speed:
-            pcie_gen = "PCIe 3.0"
-        
-        return f"{pcie_gen} x{width}", speed
-    except:
+        speed = _read_first_sysfs('current_link_speed')
+        width = _read_first_sysfs('current_link_width')
+    except OSError:
+        return "Unknown", "Unknown"
+    if speed is None or width is None:
         return "Unknown", "Unknown"
-
-
-def generate_html_report(drives_data, output_file):
-    """Generate a modern HTML report from parsed drive data"""
-    
-    # Count passed/failed drives
-    passed_count = sum(1 for d in drives_data if d['health_status'] == 'PASSED' and d['errors'] == 0)
-    total_count = len(drives_data)
     
-    # Get PCIe information
-    pcie_info, pcie_speed = get_pcie_info()
+    # Determine PCIe generation
+    pcie_gen = _PCIE_GENERATIONS.get(' '.join(speed.split()[:2]), "Unknown")
     
-    html = f"""<!DOCTYPE html>
+    return f"{pcie_gen} x{width}", speed
+
+
+# Static document head and stylesheet, written verbatim at the top of the report
+_HTML_HEAD = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>NVMe Stress Test Report</title>
     <style>
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             padding: 20px;
             min-height: 100vh;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1400px;
             margin: 0 auto;
-        }}
+        }
         
-        .header {{
+        .header {
             background: white;
             border-radius: 16px;
             padding: 40px;
             margin-bottom: 30px;
             box-shadow: 0 20px 60px rgba(0, 0, 0, 0.2);
-        }}
+        }
         
-        .header h1 {{
+        .header h1 {
             color: #1a202c;
             font-size: 2.5em;
             margin-bottom: 10px;
             font-weight: 700;
-        }}
+        }
         
-        .header .subtitle {{
+        .header .subtitle {
             color: #718096;
             font-size: 1.1em;
             margin-bottom: 20px;
-        }}
+        }
         
-        .summary-cards {{
+        .summary-cards {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
             gap: 20px;
             margin-top: 30px;
-        }}
+        }
         
-        .summary-card {{
+        .summary-card {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 25px;
             border-radius: 12px;
             text-align: center;
-        }}
+        }
         
-        .summary-card.success {{
+        .summary-card.success {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        }}
+        }
         
-        .summary-card.info {{
+        .summary-card.info {
             background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-        }}
+        }
         
-        .summary-card h3 {{
+        .summary-card h3 {
             font-size: 0.9em;
             text-transform: uppercase;
             letter-spacing: 1px;
             margin-bottom: 10px;
             opacity: 0.9;
-        }}
+        }
         
-        .summary-card .value {{
+        .summary-card .value {
             font-size: 2.5em;
             font-weight: 700;
-        }}
+        }
         
-        .drive-card {{
+        .drive-card {
             background: white;
             border-radius: 16px;
             padding: 30px;
             margin-bottom: 20px;
             box-shadow: 0 10px 40px rgba(0, 0, 0, 0.1);
             transition: transform 0.2s, box-shadow 0.2s;
-        }}
+        }
         
-        .drive-card:hover {{
+        .drive-card:hover {
             transform: translateY(-5px);
             box-shadow: 0 15px 50px rgba(0, 0, 0, 0.15);
-        }}
+        }
         
-        .drive-header {{
+        .drive-header {
             display: flex;
             justify-content: space-between;
             align-items: center;
             margin-bottom: 25px;
             padding-bottom: 20px;
             border-bottom: 2px solid #e2e8f0;
-        }}
+        }
         
-        .drive-name {{
+        .drive-name {
             font-size: 1.8em;
             font-weight: 700;
             color: #1a202c;
-        }}
+        }
         
-        .status-badge {{
+        .status-badge {
             padding: 8px 20px;
             border-radius: 20px;
             font-weight: 600;
             font-size: 0.9em;
             text-transform: uppercase;
             letter-spacing: 0.5px;
-        }}
+        }
         
-        .status-passed {{
+        .status-passed {
             background: #48bb78;
             color: white;
-        }}
+        }
         
-        .status-warning {{
+        .status-warning {
             background: #ed8936;
             color: white;
-        }}
+        }
         
-        .status-failed {{
+        .status-failed {
             background: #f56565;
             color: white;
-        }}
+        }
         
-        .specs-grid {{
+        .specs-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
             margin-bottom: 25px;
-        }}
+        }
         
-        .spec-item {{
+        .spec-item {
             background: #f7fafc;
             padding: 15px;
             border-radius: 8px;
             border-left: 4px solid #667eea;
-        }}
+        }
         
-        .spec-label {{
+        .spec-label {
             font-size: 0.85em;
             color: #718096;
             text-transform: uppercase;
             letter-spacing: 0.5px;
             margin-bottom: 5px;
-        }}
+        }
         
-        .spec-value {{
+        .spec-value {
             font-size: 1.1em;
             color: #1a202c;
             font-weight: 600;
             word-wrap: break-word;
             overflow-wrap: break-word;
             hyphens: auto;
-        }}
+        }
         
-        .performance-section {{
+        .performance-section {
             margin-top: 30px;
-        }}
+        }
         
-        .section-title {{
+        .section-title {
             font-size: 1.3em;
             color: #1a202c;
             font-weight: 700;
             margin-bottom: 15px;
             padding-bottom: 10px;
             border-bottom: 2px solid #e2e8f0;
-        }}
+        }
         
-        .perf-grid {{
+        .perf-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
             gap: 15px;
             margin-top: 15px;
-        }}
+        }
         
-        .perf-item {{
+        .perf-item {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 20px;
             border-radius: 10px;
             text-align: center;
-        }}
+        }
         
-        .perf-item h4 {{
+        .perf-item h4 {
             font-size: 0.85em;
             opacity: 0.9;
             margin-bottom: 8px;
             text-transform: uppercase;
             letter-spacing: 0.5px;
-        }}
+        }
         
-        .perf-item .value {{
+        .perf-item .value {
             font-size: 1.8em;
             font-weight: 700;
-        }}
+        }
         
-        .temp-grid {{
+        .temp-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
             gap: 10px;
             margin-top: 15px;
-        }}
+        }
         
-        .temp-item {{
+        .temp-item {
             background: #f7fafc;
             padding: 12px;
             border-radius: 8px;
             text-align: center;
             border: 2px solid #e2e8f0;
-        }}
+        }
         
-        .temp-item .label {{
+        .temp-item .label {
             font-size: 0.8em;
             color: #718096;
             margin-bottom: 5px;
-        }}
+        }
         
-        .temp-item .value {{
+        .temp-item .value {
             font-size: 1.3em;
             font-weight: 700;
             color: #1a202c;
-        }}
+        }
         
-        .footer {{
+        .footer {
             background: white;
             border-radius: 16px;
             padding: 30px;
@@ -416,96 +494,63 @@ def generate_html_report(drives_data, output_file):
             text-align: center;
             color: #718096;
             box-shadow: 0 10px 40px rgba(0, 0, 0, 0.1);
-        }}
+        }
         
-        .timestamp {{
+        .timestamp {
             font-size: 0.9em;
             color: #a0aec0;
-        }}
+        }
         
-        @media (max-width: 768px) {{
-            .specs-grid, .perf-grid, .summary-cards {{
+        @media (max-width: 768px) {
+            .specs-grid, .perf-grid, .summary-cards {
                 grid-template-columns: 1fr;
-            }}
-        }}
+            }
+        }
     </style>
 </head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🚀 NVMe Stress Test Report</h1>
-            <p class="subtitle">Comprehensive drive performance and health analysis</p>
-            
-            <div class="summary-cards">
-                <div class="summary-card success">
-                    <h3>Total Drives Tested</h3>
-                    <div class="value">{total_count}</div>
-                </div>
-                <div class="summary-card success">
-                    <h3>Drives Passed</h3>
-                    <div class="value">{passed_count}</div>
-                </div>
-                <div class="summary-card info">
-                    <h3>PCIe Interface</h3>
-                    <div class="value" style="font-size: 1.5em;">{pcie_info}</div>
-                    <p style="font-size: 0.8em; margin-top: 5px; opacity: 0.9;">{pcie_speed}</p>
-                </div>
-                <div class="summary-card info">
-                    <h3>Test Type</h3>
-                    <div class="value" style="font-size: 1.3em;">AI Workload</div>
-                </div>
-                <div class="summary-card info">
-                    <h3>Duration</h3>
-                    <div class="value" style="font-size: 1.5em;">10 min</div>
-                </div>
-            </div>
-        </div>
 """
-    
-    # Add individual drive cards
-    for drive in sorted(drives_data, key=lambda x: x['drive_name']):
-        status_class = 'status-passed' if drive['health_status'] == 'PASSED' and drive['errors'] == 0 else 'status-failed'
-        status_text = 'PASSED ✓' if drive['health_status'] == 'PASSED' and drive['errors'] == 0 else 'CHECK'
-        
-        html += f"""
+
+# Per-drive report markup, compiled once and filled in for each drive.
+# Values come from our own log parser, so they are not HTML-escaped.
+_DRIVE_CARD = Template("""
         <div class="drive-card">
             <div class="drive-header">
-                <div class="drive-name">📦 {drive['drive_name'].upper()}</div>
-                <div class="status-badge {status_class}">{status_text}</div>
+                <div class="drive-name">📦 ${drive_label}</div>
+                <div class="status-badge ${status_class}">${status_text}</div>
             </div>
             
             <div class="specs-grid">
                 <div class="spec-item">
                     <div class="spec-label">Model</div>
-                    <div class="spec-value">{drive['model']}</div>
+                    <div class="spec-value">${model}</div>
                 </div>
                 <div class="spec-item">
                     <div class="spec-label">Serial Number</div>
-                    <div class="spec-value">{drive['serial']}</div>
+                    <div class="spec-value">${serial}</div>
                 </div>
                 <div class="spec-item">
                     <div class="spec-label">Capacity</div>
-                    <div class="spec-value">{drive['capacity']}</div>
+                    <div class="spec-value">${capacity}</div>
                 </div>
                 <div class="spec-item">
                     <div class="spec-label">Firmware</div>
-                    <div class="spec-value">{drive['firmware']}</div>
+                    <div class="spec-value">${firmware}</div>
                 </div>
                 <div class="spec-item">
                     <div class="spec-label">NVMe Version</div>
-                    <div class="spec-value">{drive['nvme_version']}</div>
+                    <div class="spec-value">${nvme_version}</div>
                 </div>
                 <div class="spec-item">
                     <div class="spec-label">Health Status</div>
-                    <div class="spec-value">{drive['health_status']}</div>
+                    <div class="spec-value">${health_status}</div>
                 </div>
                 <div class="spec-item">
                     <div class="spec-label">Percentage Used</div>
-                    <div class="spec-value">{drive['percentage_used']}%</div>
+                    <div class="spec-value">${percentage_used}%</div>
                 </div>
                 <div class="spec-item">
                     <div class="spec-label">Error Count</div>
-                    <div class="spec-value">{drive['errors']}</div>
+                    <div class="spec-value">${errors}</div>
                 </div>
             </div>
             
@@ -514,27 +559,27 @@ def generate_html_report(drives_data, output_file):
                 <div class="perf-grid">
                     <div class="perf-item">
                         <h4>Read Bandwidth</h4>
-                        <div class="value">{drive['read_bw']}</div>
+                        <div class="value">${read_bw}</div>
                     </div>
                     <div class="perf-item">
                         <h4>Read IOPS</h4>
-                        <div class="value">{drive['read_iops']}</div>
+                        <div class="value">${read_iops}</div>
                     </div>
                     <div class="perf-item">
                         <h4>Write Bandwidth</h4>
-                        <div class="value">{drive['write_bw']}</div>
+                        <div class="value">${write_bw}</div>
                     </div>
                     <div class="perf-item">
                         <h4>Write IOPS</h4>
-                        <div class="value">{drive['write_iops']}</div>
+                        <div class="value">${write_iops}</div>
                     </div>
                     <div class="perf-item">
                         <h4>Data Read</h4>
-                        <div class="value">{drive['data_read']}</div>
+                        <div class="value">${data_read}</div>
                     </div>
                     <div class="perf-item">
                         <h4>Data Written</h4>
-                        <div class="value">{drive['data_written']}</div>
+                        <div class="value">${data_written}</div>
                     </div>
                 </div>
             </div>
@@ -544,32 +589,90 @@ def generate_html_report(drives_data, output_file):
                 <div class="temp-grid">
                     <div class="temp-item">
                         <div class="label">Before Test</div>
-                        <div class="value">{drive['temp_before']}°C</div>
+                        <div class="value">${temp_before}°C</div>
                     </div>
                     <div class="temp-item">
                         <div class="label">After Test</div>
-                        <div class="value">{drive['temp_after']}°C</div>
+                        <div class="value">${temp_after}°C</div>
                     </div>
-"""
-        
-        # Add temperature sensors
-        for sensor_name, temp in drive['temp_sensors_after']:
-            html += f"""
+""")
+
+_TEMP_SENSOR = Template("""
                     <div class="temp-item">
-                        <div class="label">{sensor_name}</div>
-                        <div class="value">{temp}°C</div>
+                        <div class="label">Sensor ${num}</div>
+                        <div class="value">${temp}°C</div>
                     </div>
-"""
-        
-        html += """
+""")
+
+_DRIVE_CARD_END = """
                 </div>
             </div>
         </div>
 """
+
+
+def generate_html_report(drives_data, output_file):
+    """Generate a modern HTML report from parsed drive data"""
+    
+    # Count passed/failed drives
+    passed_count = sum(1 for d in drives_data if d['health_status'] == 'PASSED' and d['errors'] == 0)
+    total_count = len(drives_data)
     
-    # Add footer
-    current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    html += f"""
+    # Get PCIe information
+    pcie_info, pcie_speed = get_pcie_info()
+    
+    # Write sections as they are produced rather than holding the whole page
+    with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as out:
+        out.write(_HTML_HEAD)
+        out.write(f"""<body>
+    <div class="container">
+        <div class="header">
+            <h1>🚀 NVMe Stress Test Report</h1>
+            <p class="subtitle">Comprehensive drive performance and health analysis</p>
+            
+            <div class="summary-cards">
+                <div class="summary-card success">
+                    <h3>Total Drives Tested</h3>
+                    <div class="value">{total_count}</div>
+                </div>
+                <div class="summary-card success">
+                    <h3>Drives Passed</h3>
+                    <div class="value">{passed_count}</div>
+                </div>
+                <div class="summary-card info">
+                    <h3>PCIe Interface</h3>
+                    <div class="value" style="font-size: 1.5em;">{pcie_info}</div>
+                    <p style="font-size: 0.8em; margin-top: 5px; opacity: 0.9;">{pcie_speed}</p>
+                </div>
+                <div class="summary-card info">
+                    <h3>Test Type</h3>
+                    <div class="value" style="font-size: 1.3em;">AI Workload</div>
+                </div>
+                <div class="summary-card info">
+                    <h3>Duration</h3>
+                    <div class="value" style="font-size: 1.5em;">10 min</div>
+                </div>
+            </div>
+        </div>
+""")
+        
+        # Add individual drive cards (callers pass them sorted by drive name)
+        for drive in drives_data:
+            passed = drive['health_status'] == 'PASSED' and drive['errors'] == 0
+            status_class, status_text = ('status-passed', 'PASSED ✓') if passed else ('status-failed', 'CHECK')
+            
+            out.write(_DRIVE_CARD.substitute(drive, drive_label=drive['drive_name'].upper(),
+                                             status_class=status_class, status_text=status_text))
+            
+            # Add temperature sensors
+            for num, temp in drive['temp_sensors_after']:
+                out.write(_TEMP_SENSOR.substitute(num=num, temp=temp))
+            
+            out.write(_DRIVE_CARD_END)
+        
+        # Add footer
+        current_time = time.strftime("%Y-%m-%d %H:%M:%S")
+        out.write(f"""
         <div class="footer">
             <h3>Test Summary</h3>
             <p style="margin: 10px 0;"><strong>All drives successfully passed comprehensive stress testing.</strong></p>
@@ -583,18 +686,24 @@ def generate_html_report(drives_data, output_file):
     </div>
 </body>
 </html>
-"""
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html)
+""")
     
     print(f"Report generated successfully: {output_file}")
 
 
+def _parse_one(log_file):
+    """Parse a single log file (runs in a worker process)"""
+    print(f"Parsing {os.path.basename(log_file)}...")
+    return NVMeLogParser(log_file).parse()
+
+
 def main():
     # Find all nvme*.log files
     log_dir = Path('/home/bizon/nvme_stress_test')
-    log_files = sorted(log_dir.glob('nvme*.log'))
+    with os.scandir(log_dir) as entries:
+        log_files = sorted(entry.path for entry in entries
+                           if entry.name.startswith('nvme') and entry.name.endswith('.log')
+                           and entry.is_file())
     
     if not log_files:
         print("No log files found!")
@@ -602,13 +711,10 @@ def main():
     
     print(f"Found {len(log_files)} log files")
     
-    # Parse all log files
-    drives_data = []
-    for log_file in log_files:
-        print(f"Parsing {log_file.name}...")
-        parser = NVMeLogParser(log_file)
-        data = parser.parse()
-        drives_data.append(data)
+    # Parse all log files, one worker process per CPU
+    with ProcessPoolExecutor() as executor:
+        drives_data = list(executor.map(_parse_one, log_files))
+    drives_data.sort(key=itemgetter('drive_name'))
     
     # Generate HTML report
     output_file = log_dir / 'nvme_stress_test_report.html'
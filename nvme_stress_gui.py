@@ -1,15 +1,21 @@
 #!/usr/bin/env python3
 import sys
 import os
+import json
+import re
+import select
+import shutil
+import signal
 import subprocess
 import time
 import threading
 from datetime import datetime
+from functools import lru_cache, partial
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                             QLabel, QPushButton, QComboBox, QSpinBox, QLineEdit, 
-                            QTextEdit, QGroupBox, QFormLayout, QMessageBox, QTabWidget,
+                            QTextEdit, QPlainTextEdit, QGroupBox, QFormLayout, QMessageBox, QTabWidget,
                             QProgressBar, QCheckBox, QRadioButton, QButtonGroup, QDialog)
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QThread
+from PyQt5.QtCore import Qt, pyqtSignal, QThread, QObject, QRunnable, QThreadPool
 from PyQt5.QtGui import QFont, QIcon, QTextCursor
 
 # AI Analysis imports
@@ -21,33 +27,167 @@ try:
 except ImportError:
     AI_AVAILABLE = False
 
+# Optional: exact token counts for the AI prompt
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# Optional: pick up hot-plugged NVMe devices without pressing Refresh
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+    INOTIFY_AVAILABLE = True
+except ImportError:
+    INOTIFY_AVAILABLE = False
+
+# Worker output is handed to the GUI in batches: every 50 lines or 100 ms,
+# whichever comes first
+OUTPUT_BATCH_LINES = 50
+OUTPUT_BATCH_INTERVAL = 0.1
+
+# smartctl -H verdicts, matched on the raw output bytes
+_HEALTH_FAILED = re.compile(rb'overall-health self-assessment test result:\s*failed', re.I)
+_HEALTH_PASSED = re.compile(rb'overall-health self-assessment test result:\s*passed|health status:\s*ok', re.I)
+
+# Lines kept in the output views; older lines are dropped
+OUTPUT_MAX_LINES = 5000
+
+# Log file names keep letters, digits, '_' and '-'; anything else becomes '_'.
+# ASCII goes through a translate table, other characters through the regex.
+_LOG_NAME_TABLE = {c: c if chr(c).isalnum() or chr(c) in '_-' else ord('_') for c in range(128)}
+_LOG_NAME_UNSAFE = re.compile(r'[^\w-]')
+
+# Test duration preset buttons: (label, seconds)
+DURATION_PRESETS = (("5 min", 300), ("10 min", 600), ("30 min", 1800), ("1 hour", 3600))
+
+# Large logs are sent for AI analysis as head, middle and tail excerpts,
+# read with seeks instead of loading the whole file
+AI_MODEL = "gpt-4o"
+AI_LOG_CHUNK_BYTES = 32768
+AI_LOG_SECTION_TOKENS = 2000
+
+
+@lru_cache(maxsize=1)
+def _token_encoding():
+    """tiktoken encoding for AI_MODEL, or None to estimate tokens from characters"""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.encoding_for_model(AI_MODEL)
+    except Exception:
+        return None
+
+
+def _limit_tokens(text, limit, keep):
+    """Cut `text` down to `limit` tokens, keeping its 'start', 'middle' or 'end'"""
+    encoding = _token_encoding()
+    if encoding is None:
+        # Roughly 4 characters per token
+        units, limit = text, limit * 4
+    else:
+        units = encoding.encode(text)
+    if len(units) <= limit:
+        return text
+    
+    if keep == 'start':
+        units = units[:limit]
+    elif keep == 'end':
+        units = units[-limit:]
+    else:
+        start = (len(units) - limit) // 2
+        units = units[start:start + limit]
+    return units if encoding is None else encoding.decode(units)
+
+
+def read_log_excerpt(log_file):
+    """Return the log text for AI analysis, cut down to its head, middle and tail if large"""
+    size = os.path.getsize(log_file)
+    with open(log_file, 'rb') as f:
+        if size <= 2 * AI_LOG_CHUNK_BYTES:
+            text = f.read().decode('utf-8', 'replace')
+            excerpt = _limit_tokens(text, 3 * AI_LOG_SECTION_TOKENS, 'start')
+            if excerpt is text:
+                return text
+            head = middle = tail = text
+        else:
+            head = f.read(AI_LOG_CHUNK_BYTES)
+            f.seek((size - AI_LOG_CHUNK_BYTES) // 2)
+            middle = f.read(AI_LOG_CHUNK_BYTES)
+            f.seek(-AI_LOG_CHUNK_BYTES, os.SEEK_END)
+            tail = f.read(AI_LOG_CHUNK_BYTES)
+            head, middle, tail = (chunk.decode('utf-8', 'replace') for chunk in (head, middle, tail))
+    
+    return "\n--- [truncated] ---\n".join((
+        _limit_tokens(head, AI_LOG_SECTION_TOKENS, 'start'),
+        _limit_tokens(middle, AI_LOG_SECTION_TOKENS, 'middle'),
+        _limit_tokens(tail, AI_LOG_SECTION_TOKENS, 'end'),
+    ))
+
+
 class WorkerThread(QThread):
-    update_signal = pyqtSignal(str)
+    update_signal = pyqtSignal(list)
+    progress_signal = pyqtSignal(int, int)  # percent done, seconds remaining
     finished_signal = pyqtSignal(bool, str)
     
-    def __init__(self, command, log_file):
+    def __init__(self, command, log_file, duration):
         super().__init__()
         self.command = command
         self.log_file = log_file
+        self.duration = duration
         self.process = None
         self.killed = False
         
     def run(self):
         try:
+            # The script gets its own session so the whole process group
+            # (script, fio, temperature logger) can be signalled on stop
             self.process = subprocess.Popen(
                 self.command,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                shell=True,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
+                start_new_session=True
             )
             
-            # Read output line by line
-            for line in iter(self.process.stdout.readline, ""):
-                if line:
-                    self.update_signal.emit(line.strip())
+            # Read output in blocks and emit complete lines in batches
+            fd = self.process.stdout.fileno()
+            os.set_blocking(fd, False)
+            tail = b''
+            pending = []
+            deadline = time.monotonic() + OUTPUT_BATCH_INTERVAL
+            
+            # Progress is reported once a second from the wall clock
+            start = next_progress = time.monotonic()
+            while True:
+                ready, _, _ = select.select([fd], [], [], OUTPUT_BATCH_INTERVAL)
+                if ready:
+                    try:
+                        chunk = os.read(fd, 65536)
+                    except BlockingIOError:
+                        chunk = None
+                    if chunk == b'':
+                        break
+                    if chunk:
+                        head, newline, tail = (tail + chunk).rpartition(b'\n')
+                        if newline:
+                            text = head.decode('utf-8', 'replace')
+                            pending.extend(line.strip() for line in text.split('\n'))
+                
+                now = time.monotonic()
+                if now >= next_progress:
+                    self.emit_progress(now - start, self.duration - (now - start))
+                    next_progress = now + 1
+                
+                if pending and (len(pending) >= OUTPUT_BATCH_LINES or time.monotonic() >= deadline):
+                    self.update_signal.emit(pending)
+                    pending = []
+                    deadline = time.monotonic() + OUTPUT_BATCH_INTERVAL
+            
+            # Flush whatever is left, including an unterminated last line
+            if tail:
+                pending.append(tail.decode('utf-8', 'replace').strip())
+            if pending:
+                self.update_signal.emit(pending)
             
             return_code = self.process.wait()
             
@@ -61,15 +201,133 @@ class WorkerThread(QThread):
         except Exception as e:
             self.finished_signal.emit(False, f"Error: {str(e)}")
     
+    def emit_progress(self, elapsed, remaining):
+        remaining = max(0, remaining)
+        total = elapsed + remaining
+        progress = min(int(elapsed / total * 100), 100) if total > 0 else 100
+        self.progress_signal.emit(progress, int(remaining))
+    
     def kill(self):
         if self.process:
             self.killed = True
-            self.process.terminate()
-            # Give it a moment to terminate gracefully
-            time.sleep(0.5)
-            # If still running, kill it
-            if self.process.poll() is None:
-                self.process.kill()
+            self.signal_group(signal.SIGTERM)
+            # Give it a moment to terminate gracefully; if still running, kill it
+            if not self.wait_for_exit(0.5):
+                self.signal_group(signal.SIGKILL)
+    
+    def signal_group(self, sig):
+        """Send `sig` to the test's process group, or just the script if that fails"""
+        try:
+            os.killpg(self.process.pid, sig)
+        except (ProcessLookupError, PermissionError):
+            self.process.send_signal(sig)
+    
+    def wait_for_exit(self, timeout):
+        """Wait up to `timeout` seconds for the process to exit, return True if it did"""
+        if self.process.poll() is not None:
+            return True
+        try:
+            pidfd = os.pidfd_open(self.process.pid)
+        except (AttributeError, OSError):
+            # No pidfd support (Python < 3.9 or Linux < 5.3), fall back to sleeping
+            time.sleep(timeout)
+            return self.process.poll() is not None
+        try:
+            # The pidfd becomes readable as soon as the process exits
+            poller = select.poll()
+            poller.register(pidfd, select.POLLIN)
+            poller.poll(int(timeout * 1000))
+        finally:
+            os.close(pidfd)
+        return self.process.poll() is not None
+
+
+class AnalysisThread(QThread):
+    """Stream an AI analysis from the OpenAI API, emitting text as it arrives"""
+    chunk_signal = pyqtSignal(str)
+    finished_signal = pyqtSignal(bool, str)
+    
+    def __init__(self, client, messages):
+        super().__init__()
+        self.client = client
+        self.messages = messages
+        self.cancelled = False
+    
+    def run(self):
+        try:
+            stream = self.client.chat.completions.create(
+                model=AI_MODEL,
+                messages=self.messages,
+                max_tokens=1000,
+                temperature=0.3,
+                stream=True
+            )
+            try:
+                for chunk in stream:
+                    if self.cancelled:
+                        break
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        self.chunk_signal.emit(chunk.choices[0].delta.content)
+            finally:
+                stream.response.close()
+            self.finished_signal.emit(True, "")
+        except Exception as e:
+            self.finished_signal.emit(False, str(e))
+    
+    def cancel(self):
+        self.cancelled = True
+
+
+class DeviceWatcher(QThread):
+    """Watch /dev with inotify and signal when NVMe device nodes come or go"""
+    devices_changed = pyqtSignal()
+    
+    def __init__(self):
+        super().__init__()
+        self.running = True
+    
+    def run(self):
+        try:
+            inotify = INotify()
+            try:
+                inotify.add_watch('/dev', inotify_flags.CREATE | inotify_flags.DELETE)
+                while self.running:
+                    # Wake at least once a second to check for stop(); a disk and
+                    # its partitions appearing together are read as one batch
+                    events = inotify.read(timeout=1000, read_delay=250)
+                    if any(event.name.startswith('nvme') for event in events):
+                        self.devices_changed.emit()
+            finally:
+                inotify.close()
+        except OSError:
+            # No inotify on /dev; the Refresh button still works
+            pass
+    
+    def stop(self):
+        self.running = False
+        self.wait()
+
+
+class CmdSignals(QObject):
+    finished = pyqtSignal(object)
+
+
+class CmdRunner(QRunnable):
+    """Run a short command off the GUI thread; emits the CompletedProcess or the raised exception"""
+    
+    def __init__(self, command, timeout=None, text=True):
+        super().__init__()
+        self.command = command
+        self.timeout = timeout
+        self.text = text
+        self.signals = CmdSignals()
+    
+    def run(self):
+        try:
+            result = subprocess.run(self.command, capture_output=True, text=self.text, timeout=self.timeout)
+        except Exception as e:
+            result = e
+        self.signals.finished.emit(result)
 
 
 class NVMeStressTestGUI(QMainWindow):
@@ -81,10 +339,25 @@ class NVMeStressTestGUI(QMainWindow):
         self.nvme_devices = []
         self.worker_thread = None
         self.log_file = None
+        self._health_cache = {}  # device path -> (summary, color) from the last health check
+        self._has_smartctl = None
+        self._mounted_devs = set()
+        self._devices_stale = False  # device nodes changed while a test was running
+        self._openai_client = None
+        self.analysis_thread = None
+        self._last_progress = None
+        self._last_status = None
         
         self.init_ui()
         self.detect_nvme_devices()
         
+        # Re-detect devices when NVMe device nodes are added or removed
+        self.device_watcher = None
+        if INOTIFY_AVAILABLE:
+            self.device_watcher = DeviceWatcher()
+            self.device_watcher.devices_changed.connect(self._on_devices_changed)
+            self.device_watcher.start()
+        
     def init_ui(self):
         # Main widget and layout
         main_widget = QWidget()
@@ -129,6 +402,7 @@ class NVMeStressTestGUI(QMainWindow):
         
         self.device_combo = QComboBox()
         self.device_combo.setMinimumWidth(400)
+        self.device_combo.currentIndexChanged.connect(self.update_device_info)
         refresh_layout.addWidget(self.device_combo)
         device_layout.addLayout(refresh_layout)
         
@@ -154,19 +428,10 @@ class NVMeStressTestGUI(QMainWindow):
         
         # Add some preset buttons
         duration_presets = QHBoxLayout()
-        preset_5min = QPushButton("5 min")
-        preset_5min.clicked.connect(lambda: self.duration_spin.setValue(300))
-        preset_10min = QPushButton("10 min")
-        preset_10min.clicked.connect(lambda: self.duration_spin.setValue(600))
-        preset_30min = QPushButton("30 min")
-        preset_30min.clicked.connect(lambda: self.duration_spin.setValue(1800))
-        preset_1hour = QPushButton("1 hour")
-        preset_1hour.clicked.connect(lambda: self.duration_spin.setValue(3600))
-        
-        duration_presets.addWidget(preset_5min)
-        duration_presets.addWidget(preset_10min)
-        duration_presets.addWidget(preset_30min)
-        duration_presets.addWidget(preset_1hour)
+        for label, seconds in DURATION_PRESETS:
+            preset_button = QPushButton(label)
+            preset_button.clicked.connect(partial(self.duration_spin.setValue, seconds))
+            duration_presets.addWidget(preset_button)
         duration_layout.addLayout(duration_presets)
         
         config_layout.addRow("Test Duration:", duration_layout)
@@ -235,16 +500,18 @@ class NVMeStressTestGUI(QMainWindow):
         
         # ===== RESULTS TAB =====
         # Output console
-        self.console_output = QTextEdit()
+        self.console_output = QPlainTextEdit()
         self.console_output.setReadOnly(True)
+        self.console_output.setMaximumBlockCount(OUTPUT_MAX_LINES)
         self.console_output.setFont(QFont("Monospace", 9))
         self.console_output.setStyleSheet("background-color: #f0f0f0;")
         results_layout.addWidget(QLabel("Test Output:"))
         results_layout.addWidget(self.console_output)
         
         # Temperature chart placeholder (we'll just use text for now)
-        self.temp_output = QTextEdit()
+        self.temp_output = QPlainTextEdit()
         self.temp_output.setReadOnly(True)
+        self.temp_output.setMaximumBlockCount(OUTPUT_MAX_LINES)
         self.temp_output.setFont(QFont("Monospace", 9))
         self.temp_output.setStyleSheet("background-color: #f0f0f0;")
         results_layout.addWidget(QLabel("Temperature Log:"))
@@ -270,38 +537,60 @@ class NVMeStressTestGUI(QMainWindow):
         buttons_layout.addWidget(self.ai_analyze_button)
         
         results_layout.addLayout(buttons_layout)
-        
-        # Setup timer for progress updates
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_progress)
-        self.start_time = 0
-        self.test_duration = 0
+    
+    def closeEvent(self, event):
+        if self.device_watcher:
+            self.device_watcher.stop()
+        super().closeEvent(event)
+    
+    def run_command_async(self, command, callback, timeout=None, text=True):
+        """Run `command` on the global thread pool and pass the result to `callback` on the GUI thread"""
+        runner = CmdRunner(command, timeout, text)
+        runner.signals.finished.connect(callback)
+        QThreadPool.globalInstance().start(runner)
     
     def detect_nvme_devices(self):
+        # Run lsblk in the background to get NVMe devices
+        self.refresh_button.setEnabled(False)
+        self.device_info.setText("Detecting NVMe devices...")
+        self.run_command_async(["lsblk", "-dJ", "-o", "NAME,SIZE,MODEL,TRAN"], self._on_devices_detected)
+    
+    def _on_devices_changed(self):
+        # Don't touch the device list under a running test; re-detect once it ends
+        if self.worker_thread and self.worker_thread.isRunning():
+            self._devices_stale = True
+        else:
+            self.detect_nvme_devices()
+    
+    def _on_devices_detected(self, result):
+        self.refresh_button.setEnabled(True)
         try:
-            # Clear previous devices
+            if isinstance(result, Exception):
+                raise result
+            
+            # Remember the selected drive so it stays selected after the refresh
+            idx = self.device_combo.currentIndex()
+            selected_path = self.nvme_devices[idx]['path'] if 0 <= idx < len(self.nvme_devices) else None
+            
+            # Clear previous devices and cached health/tool checks
             self.nvme_devices = []
+            self._health_cache.clear()
+            self._has_smartctl = None
+            self.refresh_mounts()
+            self.device_combo.blockSignals(True)
             self.device_combo.clear()
             
-            # Run lsblk to get NVMe devices
-            result = subprocess.run(
-                ["lsblk", "-d", "-o", "NAME,SIZE,MODEL"],
-                capture_output=True,
-                text=True
-            )
-            
             if result.returncode != 0:
+                self.device_combo.blockSignals(False)
                 QMessageBox.critical(self, "Error", "Failed to detect NVMe devices")
                 return
             
             # Parse output
-            lines = result.stdout.strip().split('\n')
-            for line in lines:
-                if 'nvme' in line:
-                    parts = line.split()
-                    name = parts[0]
-                    size = parts[1]
-                    model = ' '.join(parts[2:]) if len(parts) > 2 else "Unknown"
+            for device in json.loads(result.stdout).get('blockdevices', []):
+                if device.get('tran') == 'nvme':
+                    name = device['name']
+                    size = device.get('size') or "Unknown"
+                    model = (device.get('model') or "").strip() or "Unknown"
                     
                     self.nvme_devices.append({
                         'name': name,
@@ -312,17 +601,19 @@ class NVMeStressTestGUI(QMainWindow):
                     
                     self.device_combo.addItem(f"{name} ({size}, {model})")
             
+            # Re-enable signals after populating to avoid triggering during setup
+            self.device_combo.blockSignals(False)
+            
             if not self.nvme_devices:
                 self.device_info.setText("No NVMe devices found")
                 self.health_check_button.setEnabled(False)
             else:
-                self.device_combo.setCurrentIndex(0)
+                paths = [device['path'] for device in self.nvme_devices]
+                self.device_combo.setCurrentIndex(paths.index(selected_path) if selected_path in paths else 0)
                 self.update_device_info()
                 
-            # Connect signal after populating to avoid triggering during setup
-            self.device_combo.currentIndexChanged.connect(self.update_device_info)
-                
         except Exception as e:
+            self.device_combo.blockSignals(False)
             QMessageBox.critical(self, "Error", f"Error detecting NVMe devices: {str(e)}")
     
     def update_device_info(self):
@@ -331,42 +622,35 @@ class NVMeStressTestGUI(QMainWindow):
             device = self.nvme_devices[idx]
             self.health_check_button.setEnabled(True)
             
-            # Check if mounted
-            is_mounted = self.check_if_mounted(device['name'])
-            mount_status = "Currently mounted" if is_mounted else "Not mounted"
-            
-            # Get health summary
-            health_summary, health_color = self.get_health_summary(device['path'])
-
-            self.device_info.setText(
-                f"Device: {device['path']}\n"
-                f"Size: {device['size']}\n"
-                f"Model: {device['model']}\n"
-                f"Status: {mount_status}\n"
-                f"<b>Health: <font color='{health_color}'>{health_summary}</font></b>"
-            )
-
-    def get_health_summary(self, device_path):
-        try:
-            if not self.is_tool("smartctl"):
-                return "smartctl not found", "orange"
+            # Health is only probed on request; show the last result if there is one
+            health = self._health_cache.get(device['path'], ("Click 'Check Device Health' to scan", "gray"))
+            self.show_device_info(device, *health)
+    
+    def show_device_info(self, device, health_summary, health_color):
+        # Check if mounted
+        is_mounted = self.check_if_mounted(device['name'])
+        mount_status = "Currently mounted" if is_mounted else "Not mounted"
+        
+        self.device_info.setText(
+            f"Device: {device['path']}\n"
+            f"Size: {device['size']}\n"
+            f"Model: {device['model']}\n"
+            f"Status: {mount_status}\n"
+            f"<b>Health: <font color='{health_color}'>{health_summary}</font></b>"
+        )
 
-            result = subprocess.run(
-                ["sudo", "smartctl", "-H", device_path],
-                capture_output=True, text=True, timeout=5
-            )
-            
-            output = result.stdout.lower() + result.stderr.lower()
-            if "overall-health self-assessment test result: passed" in output or "health status: ok" in output:
-                return "Healthy", "green"
-            elif "overall-health self-assessment test result: failed" in output:
-                return "Failed", "red"
-            else:
-                return "Unknown", "orange"
-        except subprocess.TimeoutExpired:
+    def _parse_health(self, result):
+        if isinstance(result, subprocess.TimeoutExpired):
             return "Timeout", "orange"
-        except Exception:
+        if isinstance(result, Exception):
             return "Error fetching status", "red"
+        
+        if _HEALTH_FAILED.search(result.stdout) or _HEALTH_FAILED.search(result.stderr):
+            return "Failed", "red"
+        elif _HEALTH_PASSED.search(result.stdout) or _HEALTH_PASSED.search(result.stderr):
+            return "Healthy", "green"
+        else:
+            return "Unknown", "orange"
 
     def show_health_report(self):
         idx = self.device_combo.currentIndex()
@@ -376,61 +660,80 @@ class NVMeStressTestGUI(QMainWindow):
         device = self.nvme_devices[idx]
         device_path = device['path']
 
-        if not self.is_tool("smartctl"):
+        if not self.has_smartctl():
             QMessageBox.critical(self, "Error", "smartctl command not found. Please install 'smartmontools'.")
             return
 
-        try:
-            self.status_label.setText(f"Running health check on {device_path}...")
-            QApplication.processEvents()
-
-            result = subprocess.run(
-                ["sudo", "smartctl", "-a", device_path],
-                capture_output=True, text=True, timeout=10
-            )
-            
-            self.status_label.setText("Ready")
-
-            dialog = QDialog(self)
-            dialog.setWindowTitle(f"SMART Health Report for {device_path}")
-            dialog.setMinimumSize(700, 500)
-            
-            layout = QVBoxLayout()
-            text_edit = QTextEdit()
-            text_edit.setReadOnly(True)
-            text_edit.setFont(QFont("Monospace", 9))
-            text_edit.setText(result.stdout if result.stdout else result.stderr)
-            layout.addWidget(text_edit)
-            
-            close_button = QPushButton("Close")
-            close_button.clicked.connect(dialog.close)
-            layout.addWidget(close_button)
-            
-            dialog.setLayout(layout)
-            dialog.exec_()
+        self.status_label.setText(f"Running health check on {device_path}...")
+        self.run_command_async(
+            ["sudo", "smartctl", "-a", device_path],
+            partial(self._on_health_report, device_path), timeout=10, text=False
+        )
 
-        except subprocess.TimeoutExpired:
-            self.status_label.setText("Ready")
+    def _on_health_report(self, device_path, result):
+        self.status_label.setText("Ready")
+        
+        # Remember the verdict and show it in the device info if still selected
+        summary, color = self._parse_health(result)
+        self._health_cache[device_path] = (summary, color)
+        idx = self.device_combo.currentIndex()
+        if idx >= 0 and idx < len(self.nvme_devices) and self.nvme_devices[idx]['path'] == device_path:
+            self.show_device_info(self.nvme_devices[idx], summary, color)
+        
+        if isinstance(result, subprocess.TimeoutExpired):
             QMessageBox.critical(self, "Error", "Health check timed out.")
-        except Exception as e:
-            self.status_label.setText("Ready")
-            QMessageBox.critical(self, "Error", f"Failed to run health check: {str(e)}")
+            return
+        if isinstance(result, Exception):
+            QMessageBox.critical(self, "Error", f"Failed to run health check: {str(result)}")
+            return
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"SMART Health Report for {device_path}")
+        dialog.setMinimumSize(700, 500)
+        
+        layout = QVBoxLayout()
+        text_edit = QTextEdit()
+        text_edit.setReadOnly(True)
+        text_edit.setFont(QFont("Monospace", 9))
+        text_edit.setText((result.stdout or result.stderr).decode('utf-8', 'replace'))
+        layout.addWidget(text_edit)
+        
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(dialog.close)
+        layout.addWidget(close_button)
+        
+        dialog.setLayout(layout)
+        dialog.exec_()
 
     def is_tool(self, name):
         """Check whether `name` is on PATH."""
-        try:
-            subprocess.run([name, "--version"], capture_output=True, text=True, check=True, timeout=2)
-            return True
-        except (FileNotFoundError, subprocess.CalledProcessError, subprocess.TimeoutExpired):
-            return False
+        return shutil.which(name) is not None
     
-    def check_if_mounted(self, device_name):
+    def has_smartctl(self):
+        """Check for smartctl once and remember the answer until the next refresh"""
+        if self._has_smartctl is None:
+            self._has_smartctl = self.is_tool("smartctl")
+        return self._has_smartctl
+    
+    def refresh_mounts(self):
+        """Read /proc/mounts once into the set of mounted devices"""
+        mounted = set()
         try:
             with open('/proc/mounts', 'r') as f:
-                mounts = f.read()
-                return f"/dev/{device_name}" in mounts
+                for line in f:
+                    source = line.split(None, 1)[0]
+                    if source.startswith('/dev/'):
+                        mounted.add(source)
+                        # A mounted partition (/dev/nvme0n1p1) marks its disk as mounted too
+                        disk, sep, part = source.rpartition('p')
+                        if sep and part.isdigit() and disk[-1:].isdigit():
+                            mounted.add(disk)
         except Exception:
-            return False
+            pass
+        self._mounted_devs = mounted
+    
+    def check_if_mounted(self, device_name):
+        return f"/dev/{device_name}" in self._mounted_devs
     
     def start_test(self):
         idx = self.device_combo.currentIndex()
@@ -442,6 +745,7 @@ class NVMeStressTestGUI(QMainWindow):
         device_path = device['path']
 
         # Check if mounted and unmount if necessary
+        self.refresh_mounts()
         is_mounted = self.check_if_mounted(device['name'])
         if is_mounted and self.auto_unmount.isChecked():
             try:
@@ -473,7 +777,9 @@ class NVMeStressTestGUI(QMainWindow):
         if not log_name:
             log_name = f"nvme_stress_{device['name']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         else:
-            log_name = ''.join(c if c.isalnum() or c in '_-' else '_' for c in log_name)
+            log_name = log_name.translate(_LOG_NAME_TABLE)
+            if not log_name.isascii():
+                log_name = _LOG_NAME_UNSAFE.sub('_', log_name)
         self.log_file = os.path.abspath(f"{log_name}.log")
 
         # Prepare to call the external script
@@ -484,22 +790,20 @@ class NVMeStressTestGUI(QMainWindow):
             QMessageBox.critical(self, "Error", f"Test script not found at {script_path}")
             return
 
-        # The command is now a simple call to our robust shell script
-        full_command = f'"{script_path}" "{device_path}" {duration} "{self.log_file}" "{workload_type}"'
+        # The command is a simple call to our robust shell script, run without a shell
+        command = [script_path, device_path, str(duration), self.log_file, workload_type]
 
         # Start worker thread
         self.start_button.setEnabled(False)
         self.stop_button.setEnabled(True)
         self.status_label.setText(f"Starting test on {device_path}...")
+        self._last_progress = self._last_status = None
         self.console_output.clear()
         self.temp_output.clear()
 
-        self.test_duration = duration
-        self.start_time = time.time()
-        self.timer.start(1000)  # Update every second
-
-        self.worker_thread = WorkerThread(full_command, self.log_file)
+        self.worker_thread = WorkerThread(command, self.log_file, duration)
         self.worker_thread.update_signal.connect(self.update_output)
+        self.worker_thread.progress_signal.connect(self.update_progress)
         self.worker_thread.finished_signal.connect(self.test_finished)
         self.worker_thread.start()
     
@@ -517,24 +821,35 @@ class NVMeStressTestGUI(QMainWindow):
                 self.worker_thread.kill()
                 self.status_label.setText("Stopping test...")
     
-    def update_output(self, line):
-        # Update console output
-        self.console_output.append(line)
-        self.console_output.moveCursor(QTextCursor.End)
-        
-        # If it's a temperature line, add it to the temperature output
-        if "[TEMP]" in line:
-            self.temp_output.append(line)
-            self.temp_output.moveCursor(QTextCursor.End)
+    def update_output(self, lines):
+        # Update console output with the whole batch at once
+        self.append_output(self.console_output, '\n'.join(lines))
+        
+        # Add temperature lines to the temperature output
+        temp_lines = [line for line in lines if line.startswith("[TEMP]")]
+        if temp_lines:
+            self.append_output(self.temp_output, '\n'.join(temp_lines))
+    
+    def append_output(self, view, text):
+        """Append to an output view; follow the tail only if it was already scrolled to the bottom"""
+        bar = view.verticalScrollBar()
+        at_bottom = bar.value() == bar.maximum()
+        view.appendPlainText(text)
+        if at_bottom:
+            bar.setValue(bar.maximum())
     
     def test_finished(self, success, message):
-        self.timer.stop()
         self.progress_bar.setValue(100 if success else 0)
         self.status_label.setText(message)
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
         self.open_log_button.setEnabled(True)
         
+        # Pick up device changes that were held back during the test
+        if self._devices_stale:
+            self._devices_stale = False
+            self.detect_nvme_devices()
+        
         # Enable AI analyze button if AI is available and we have a log file
         if AI_AVAILABLE and self.log_file and os.path.exists(self.log_file):
             self.ai_analyze_button.setEnabled(True)
@@ -544,17 +859,14 @@ class NVMeStressTestGUI(QMainWindow):
         else:
             QMessageBox.warning(self, "Test Failed", message)
     
-    def update_progress(self):
-        if self.test_duration <= 0:
-            return
-            
-        elapsed = time.time() - self.start_time
-        progress = min(int((elapsed / self.test_duration) * 100), 100)
-        self.progress_bar.setValue(progress)
+    def update_progress(self, progress, remaining):
+        # Only touch the widgets when what they show actually changes
+        if progress != self._last_progress:
+            self.progress_bar.setValue(progress)
+            self._last_progress = progress
         
         # Update remaining time
-        remaining = max(0, self.test_duration - elapsed)
-        minutes, seconds = divmod(int(remaining), 60)
+        minutes, seconds = divmod(remaining, 60)
         hours, minutes = divmod(minutes, 60)
         
         if hours > 0:
@@ -563,8 +875,11 @@ class NVMeStressTestGUI(QMainWindow):
             time_str = f"{minutes}m {seconds}s remaining"
         else:
             time_str = f"{seconds}s remaining"
-            
-        self.status_label.setText(f"Running test... {time_str}")
+        
+        status = f"Running test... {time_str}"
+        if status != self._last_status:
+            self.status_label.setText(status)
+            self._last_status = status
     
     def open_log_file(self):
         if not self.log_file or not os.path.exists(self.log_file):
@@ -600,45 +915,53 @@ class NVMeStressTestGUI(QMainWindow):
             return
         
         try:
-            # Show progress dialog
-            progress_dialog = QMessageBox(self)
-            progress_dialog.setWindowTitle("AI Analysis")
-            progress_dialog.setText("Analyzing test results with AI...\nThis may take a few moments.")
-            progress_dialog.setStandardButtons(QMessageBox.NoButton)
-            progress_dialog.show()
-            QApplication.processEvents()
-            
-            # Read the log file
-            with open(self.log_file, 'r') as f:
-                log_content = f.read()
+            # Read the relevant parts of the log file
+            log_excerpt = read_log_excerpt(self.log_file)
             
             # Prepare the prompt for AI analysis
-            prompt = self._create_analysis_prompt(log_content)
-            
-            # Call OpenAI API
-            client = openai.OpenAI(api_key=api_key)
-            response = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are an expert NVMe storage analyst. Analyze test logs and provide concise, actionable insights about drive health, performance, and any issues found."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1000,
-                temperature=0.3
-            )
-            
-            progress_dialog.close()
-            
-            # Display the analysis result
-            analysis = response.choices[0].message.content
-            self._show_analysis_result(analysis)
+            prompt = self._create_analysis_prompt(log_excerpt)
             
+            # Reuse the client (and its connection pool) across analyses
+            if self._openai_client is None or self._openai_client.api_key != api_key:
+                self._openai_client = openai.OpenAI(api_key=api_key, timeout=30, max_retries=2)
         except Exception as e:
-            progress_dialog.close()
             QMessageBox.critical(self, "AI Analysis Error", 
                                f"Failed to analyze log file:\n{str(e)}")
+            return
+        
+        # Show the result dialog right away and stream the analysis into it;
+        # closing the dialog stops the stream
+        dialog, text_edit = self._show_analysis_result()
+        self.analysis_thread = AnalysisThread(self._openai_client, [
+            {"role": "system", "content": "You are an expert NVMe storage analyst. Analyze test logs and provide concise, actionable insights about drive health, performance, and any issues found."},
+            {"role": "user", "content": prompt}
+        ])
+        self.analysis_thread.chunk_signal.connect(partial(self._append_analysis, text_edit))
+        self.analysis_thread.finished_signal.connect(partial(self._analysis_finished, dialog))
+        dialog.finished.connect(self.analysis_thread.cancel)
+        self.ai_analyze_button.setEnabled(False)
+        self.analysis_thread.start()
+    
+    def _append_analysis(self, text_edit, text):
+        """Add streamed analysis text, following the tail if already at the bottom"""
+        bar = text_edit.verticalScrollBar()
+        at_bottom = bar.value() == bar.maximum()
+        cursor = QTextCursor(text_edit.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
+        if at_bottom:
+            bar.setValue(bar.maximum())
     
-    def _create_analysis_prompt(self, log_content):
+    def _analysis_finished(self, dialog, success, message):
+        self.ai_analyze_button.setEnabled(True)
+        if success:
+            dialog.setWindowTitle("🤖 AI Analysis Results")
+        else:
+            dialog.close()
+            QMessageBox.critical(self, "AI Analysis Error", 
+                               f"Failed to analyze log file:\n{message}")
+    
+    def _create_analysis_prompt(self, log_excerpt):
         """Create a structured prompt for AI analysis"""
         return f"""Please analyze this NVMe stress test log and provide a concise report with the following:
 
@@ -652,20 +975,19 @@ class NVMeStressTestGUI(QMainWindow):
 Keep the analysis concise but thorough. Focus on actionable insights.
 
 --- TEST LOG ---
-{log_content[:8000]}  # Limit to first 8000 chars to stay within token limits
+{log_excerpt}
 --- END LOG ---"""
     
-    def _show_analysis_result(self, analysis):
-        """Display the AI analysis result in a dialog"""
+    def _show_analysis_result(self):
+        """Open the (non-modal) AI analysis dialog, return it and its text view"""
         dialog = QDialog(self)
-        dialog.setWindowTitle("🤖 AI Analysis Results")
+        dialog.setWindowTitle("🤖 AI Analysis (analyzing...)")
         dialog.setMinimumSize(600, 400)
         
         layout = QVBoxLayout()
         
         # Analysis text
-        text_edit = QTextEdit()
-        text_edit.setPlainText(analysis)
+        text_edit = QPlainTextEdit()
         text_edit.setReadOnly(True)
         text_edit.setFont(QFont("Arial", 10))
         layout.addWidget(text_edit)
@@ -676,7 +998,8 @@ Keep the analysis concise but thorough. Focus on actionable insights.
         layout.addWidget(close_button)
         
         dialog.setLayout(layout)
-        dialog.exec_()
+        dialog.show()
+        return dialog, text_edit
 
 
 if __name__ == "__main__":
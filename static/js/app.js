@@ -21,7 +21,7 @@ function initSocket() {
     
     socket.on('test_output', (data) => {
         if (data.test_id === currentTestId) {
-            appendConsoleOutput(data.line);
+            appendConsoleLines(data.lines);
         }
     });
     
@@ -80,7 +80,7 @@ function refreshDevices() {
                                 ${device.name}
                             </h5>
                             <div class="text-muted small">
-                                <div><i class="fas fa-database"></i> ${device.size}</div>
+                                <div><i class="fas fa-database"></i> ${typeof device.size === 'number' ? formatBytes(device.size) : device.size}</div>
                                 <div><i class="fas fa-tag"></i> ${device.model}</div>
                                 <div><i class="fas fa-map-marker-alt"></i> ${device.path}</div>
                             </div>
@@ -322,23 +322,32 @@ function testFinished(success, message) {
 
 // Append to console output
 function appendConsoleOutput(line) {
+    appendConsoleLines([line]);
+}
+
+// Append a batch of lines to console output
+function appendConsoleLines(lines) {
     const console = document.getElementById('consoleOutput');
     
-    // If this is the first line, clear the placeholder
+    // If these are the first lines, clear the placeholder
     if (console.querySelector('.text-muted')) {
         console.innerHTML = '';
     }
     
-    const lineDiv = document.createElement('div');
-    lineDiv.className = 'line';
-    
-    // Highlight temperature lines
-    if (line.includes('[TEMP]')) {
-        lineDiv.className += ' temp-line';
-    }
-    
-    lineDiv.textContent = line;
-    console.appendChild(lineDiv);
+    const fragment = document.createDocumentFragment();
+    lines.forEach(line => {
+        const lineDiv = document.createElement('div');
+        lineDiv.className = 'line';
+        
+        // Highlight temperature lines
+        if (line.includes('[TEMP]')) {
+            lineDiv.className += ' temp-line';
+        }
+        
+        lineDiv.textContent = line;
+        fragment.appendChild(lineDiv);
+    });
+    console.appendChild(fragment);
     
     // Auto-scroll to bottom
     console.scrollTop = console.scrollHeight;
@@ -397,10 +406,13 @@ function refreshLogs() {
 // View log content
 function viewLog(logName) {
     fetch(`/api/log/${logName}`)
-        .then(response => response.json())
-        .then(data => {
+        .then(response => {
+            if (!response.ok) throw new Error(response.statusText);
+            return response.text();
+        })
+        .then(content => {
             document.getElementById('logModalTitle').textContent = logName;
-            document.getElementById('logContent').textContent = data.content;
+            document.getElementById('logContent').textContent = content;
             document.getElementById('downloadLogBtn').onclick = () => downloadLog(logName);
             
             const modal = new bootstrap.Modal(document.getElementById('logModal'));
@@ -491,7 +503,7 @@ function createToastContainer() {
 function formatBytes(bytes) {
     if (bytes === 0) return '0 Bytes';
     const k = 1024;
-    const sizes = ['Bytes', 'KB', 'MB', 'GB'];
+    const sizes = ['Bytes', 'KB', 'MB', 'GB', 'TB'];
     const i = Math.floor(Math.log(bytes) / Math.log(k));
     return Math.round(bytes / Math.pow(k, i) * 100) / 100 + ' ' + sizes[i];
 }
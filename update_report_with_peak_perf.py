@@ -3,290 +3,346 @@
 Update NVMe report with peak performance data
 """
 
+import gzip
 import json
+import mmap
 import re
 import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
 from pathlib import Path
+from string import Template
 from generate_report import NVMeLogParser, get_pcie_info
 from datetime import datetime
 
+# Use orjson for FIO output when available, it is several times faster
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# With ijson the FIO output is stream-parsed and the latency histograms are
+# never materialized
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+
+def _first_job_bw(f):
+    """Return the first job's read bw if > 0, else its write bw, from ijson parse events"""
+    write_bw = 0
+    for prefix, event, value in ijson.parse(f):
+        if prefix == 'jobs.item.read.bw':
+            if value > 0:
+                return value
+        elif prefix == 'jobs.item.write.bw':
+            write_bw = value
+        elif prefix == 'jobs.item' and event == 'end_map':
+            break
+    return write_bw if write_bw > 0 else None
+
+
+# The first job's bandwidth, picked out of the raw FIO JSON without decoding
+# it; "bw" comes before any nested object in the "read"/"write" sections
+_READ_BW = re.compile(rb'"read"\s*:\s*\{[^{}]*?"bw"\s*:\s*(\d+)')
+_WRITE_BW = re.compile(rb'"write"\s*:\s*\{[^{}]*?"bw"\s*:\s*(\d+)')
+
+
+def _scan_bw(data):
+    """Return the first job's read bw if > 0, else its write bw; None if the scan finds neither"""
+    read = _READ_BW.search(data)
+    if read and int(read.group(1)) > 0:
+        return int(read.group(1))
+    write = _WRITE_BW.search(data)
+    if write:
+        return int(write.group(1))
+    return 0 if read else None
+
+
+def _decoded_bw(data):
+    """Return the first job's read bw if > 0, else its write bw, from the decoded document"""
+    if 'jobs' in data and len(data['jobs']) > 0:
+        job = data['jobs'][0]
+        
+        # Check for read or write (make sure bw > 0)
+        for side in ('read', 'write'):
+            bw = job.get(side, {}).get('bw', 0)
+            if bw > 0:
+                return bw
+    
+    return None
+
+
 def parse_fio_json(json_file):
     """Parse FIO JSON output and extract bandwidth in MiB/s"""
     try:
-        with open(json_file, 'r') as f:
-            data = json.load(f)
-        
-        # Get bandwidth from first job in KB/s, convert to MiB/s
-        if 'jobs' in data and len(data['jobs']) > 0:
-            job = data['jobs'][0]
-            
-            # Check for read or write (make sure bw > 0)
-            if 'read' in job and 'bw' in job['read'] and job['read']['bw'] > 0:
-                bw_kbs = job['read']['bw']
-                return int(bw_kbs / 1024)  # Convert KB/s to MiB/s
-            elif 'write' in job and 'bw' in job['write'] and job['write']['bw'] > 0:
-                bw_kbs = job['write']['bw']
-                return int(bw_kbs / 1024)  # Convert KB/s to MiB/s
-        
-        return None
+        # Get bandwidth from first job in KB/s, scanning the mapped file and
+        # parsing the whole document only if the scan doesn't find it
+        with open(json_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            bw_kbs = _scan_bw(mm)
+            if bw_kbs is None:
+                bw_kbs = _first_job_bw(f) if IJSON_AVAILABLE else _decoded_bw(json_loads(mm[:]))
+        
+        return bw_kbs >> 10 if bw_kbs else None  # Convert KB/s to MiB/s
     except Exception as e:
         print(f"Error parsing {json_file}: {e}")
         return None
 
 
-def generate_html_report_with_peak(drives_data, output_file):
-    """Generate HTML report with peak performance data"""
-    
-    passed_count = sum(1 for d in drives_data if d['health_status'] == 'PASSED' and d['errors'] == 0)
-    total_count = len(drives_data)
-    
-    pcie_info, pcie_speed = get_pcie_info()
-    
-    html = f"""<!DOCTYPE html>
+# Peak bandwidth per FIO file name as [mtime_ns, size, MiB/s or None],
+# stored in the log directory between runs
+FIO_CACHE_NAME = '.fio_cache.json'
+
+
+# Static document head and stylesheet, written verbatim at the top of the report
+_HTML_HEAD = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>NVMe Stress Test Report</title>
     <style>
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             padding: 20px;
             min-height: 100vh;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1400px;
             margin: 0 auto;
-        }}
+        }
         
-        .header {{
+        .header {
             background: white;
             border-radius: 16px;
             padding: 40px;
             margin-bottom: 30px;
             box-shadow: 0 20px 60px rgba(0, 0, 0, 0.2);
-        }}
+        }
         
-        .header h1 {{
+        .header h1 {
             color: #1a202c;
             font-size: 2.5em;
             margin-bottom: 10px;
             font-weight: 700;
-        }}
+        }
         
-        .header .subtitle {{
+        .header .subtitle {
             color: #718096;
             font-size: 1.1em;
             margin-bottom: 20px;
-        }}
+        }
         
-        .summary-cards {{
+        .summary-cards {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
             gap: 20px;
             margin-top: 30px;
-        }}
+        }
         
-        .summary-card {{
+        .summary-card {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 25px;
             border-radius: 12px;
             text-align: center;
-        }}
+        }
         
-        .summary-card.success {{
+        .summary-card.success {
             background: linear-gradient(135deg, #48bb78 0%, #38a169 100%);
-        }}
+        }
         
-        .summary-card.info {{
+        .summary-card.info {
             background: linear-gradient(135deg, #4299e1 0%, #3182ce 100%);
-        }}
+        }
         
-        .summary-card h3 {{
+        .summary-card h3 {
             font-size: 0.9em;
             text-transform: uppercase;
             letter-spacing: 1px;
             margin-bottom: 10px;
             opacity: 0.9;
-        }}
+        }
         
-        .summary-card .value {{
+        .summary-card .value {
             font-size: 2.5em;
             font-weight: 700;
-        }}
+        }
         
-        .drive-card {{
+        .drive-card {
             background: white;
             border-radius: 16px;
             padding: 30px;
             margin-bottom: 20px;
             box-shadow: 0 10px 40px rgba(0, 0, 0, 0.1);
             transition: transform 0.2s, box-shadow 0.2s;
-        }}
+        }
         
-        .drive-card:hover {{
+        .drive-card:hover {
             transform: translateY(-5px);
             box-shadow: 0 15px 50px rgba(0, 0, 0, 0.15);
-        }}
+        }
         
-        .drive-header {{
+        .drive-header {
             display: flex;
             justify-content: space-between;
             align-items: center;
             margin-bottom: 25px;
             padding-bottom: 20px;
             border-bottom: 2px solid #e2e8f0;
-        }}
+        }
         
-        .drive-name {{
+        .drive-name {
             font-size: 1.8em;
             font-weight: 700;
             color: #1a202c;
-        }}
+        }
         
-        .status-badge {{
+        .status-badge {
             padding: 8px 20px;
             border-radius: 20px;
             font-weight: 600;
             font-size: 0.9em;
             text-transform: uppercase;
             letter-spacing: 0.5px;
-        }}
+        }
         
-        .status-passed {{
+        .status-passed {
             background: #48bb78;
             color: white;
-        }}
+        }
         
-        .status-warning {{
+        .status-warning {
             background: #ed8936;
             color: white;
-        }}
+        }
         
-        .status-failed {{
+        .status-failed {
             background: #f56565;
             color: white;
-        }}
+        }
         
-        .specs-grid {{
+        .specs-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
             margin-bottom: 25px;
-        }}
+        }
         
-        .spec-item {{
+        .spec-item {
             background: #f7fafc;
             padding: 15px;
             border-radius: 8px;
             border-left: 4px solid #667eea;
-        }}
+        }
         
-        .spec-label {{
+        .spec-label {
             font-size: 0.85em;
             color: #718096;
             text-transform: uppercase;
             letter-spacing: 0.5px;
             margin-bottom: 5px;
-        }}
+        }
         
-        .spec-value {{
+        .spec-value {
             font-size: 0.95em;
             color: #1a202c;
             font-weight: 600;
             word-wrap: break-word;
             overflow-wrap: break-word;
             line-height: 1.3;
-        }}
+        }
         
-        .performance-section {{
+        .performance-section {
             margin-top: 30px;
-        }}
+        }
         
-        .section-title {{
+        .section-title {
             font-size: 1.3em;
             color: #1a202c;
             font-weight: 700;
             margin-bottom: 15px;
             padding-bottom: 10px;
             border-bottom: 2px solid #e2e8f0;
-        }}
+        }
         
-        .perf-grid {{
+        .perf-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 15px;
             margin-top: 15px;
-        }}
+        }
         
-        .perf-item {{
+        .perf-item {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 20px;
             border-radius: 10px;
             text-align: center;
-        }}
+        }
         
-        .perf-item.peak {{
+        .perf-item.peak {
             background: linear-gradient(135deg, #48bb78 0%, #38a169 100%);
-        }}
+        }
         
-        .perf-item h4 {{
+        .perf-item h4 {
             font-size: 0.85em;
             opacity: 0.9;
             margin-bottom: 8px;
             text-transform: uppercase;
             letter-spacing: 0.5px;
-        }}
+        }
         
-        .perf-item .value {{
+        .perf-item .value {
             font-size: 1.8em;
             font-weight: 700;
-        }}
+        }
         
-        .perf-item .subtext {{
+        .perf-item .subtext {
             font-size: 0.75em;
             opacity: 0.8;
             margin-top: 5px;
-        }}
+        }
         
-        .temp-grid {{
+        .temp-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
             gap: 10px;
             margin-top: 15px;
-        }}
+        }
         
-        .temp-item {{
+        .temp-item {
             background: #f7fafc;
             padding: 12px;
             border-radius: 8px;
             text-align: center;
             border: 2px solid #e2e8f0;
-        }}
+        }
         
-        .temp-item .label {{
+        .temp-item .label {
             font-size: 0.8em;
             color: #718096;
             margin-bottom: 5px;
-        }}
+        }
         
-        .temp-item .value {{
+        .temp-item .value {
             font-size: 1.3em;
             font-weight: 700;
             color: #1a202c;
-        }}
+        }
         
-        .footer {{
+        .footer {
             background: white;
             border-radius: 16px;
             padding: 30px;
@@ -294,64 +350,64 @@ def generate_html_report_with_peak(drives_data, output_file):
             text-align: center;
             color: #718096;
             box-shadow: 0 10px 40px rgba(0, 0, 0, 0.1);
-        }}
+        }
         
-        .timestamp {{
+        .timestamp {
             font-size: 0.9em;
             color: #a0aec0;
-        }}
+        }
         
-        @media (max-width: 768px) {{
-            .specs-grid, .perf-grid, .summary-cards {{
+        @media (max-width: 768px) {
+            .specs-grid, .perf-grid, .summary-cards {
                 grid-template-columns: 1fr;
-            }}
-        }}
+            }
+        }
         
-        @media print {{
-            * {{
+        @media print {
+            * {
                 -webkit-print-color-adjust: exact !important;
                 print-color-adjust: exact !important;
                 color-adjust: exact !important;
-            }}
+            }
             
-            body {{
+            body {
                 background: white !important;
                 padding: 0;
                 margin: 0;
-            }}
+            }
             
-            .container {{
+            .container {
                 max-width: 100%;
                 padding: 20px;
-            }}
+            }
             
-            .header {{
+            .header {
                 box-shadow: none;
                 page-break-inside: avoid !important;
                 page-break-after: avoid !important;
                 border: 1px solid #e2e8f0;
                 margin-bottom: 20px;
                 background: white !important;
-            }}
+            }
             
-            .summary-cards {{
+            .summary-cards {
                 page-break-inside: avoid !important;
-            }}
+            }
             
-            .summary-card {{
+            .summary-card {
                 background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
                 page-break-inside: avoid !important;
-            }}
+            }
             
-            .summary-card.success {{
+            .summary-card.success {
                 background: linear-gradient(135deg, #48bb78 0%, #38a169 100%) !important;
-            }}
+            }
             
-            .summary-card.info {{
+            .summary-card.info {
                 background: linear-gradient(135deg, #4299e1 0%, #3182ce 100%) !important;
-            }}
+            }
             
-            .drive-card {{
+            .drive-card {
                 page-break-inside: avoid !important;
                 page-break-before: auto !important;
                 page-break-after: auto !important;
@@ -359,146 +415,108 @@ def generate_html_report_with_peak(drives_data, output_file):
                 border: 1px solid #e2e8f0;
                 margin-bottom: 20px;
                 background: white !important;
-            }}
+            }
             
-            .drive-header {{
+            .drive-header {
                 page-break-inside: avoid !important;
                 page-break-after: avoid !important;
-            }}
+            }
             
-            .specs-grid {{
+            .specs-grid {
                 page-break-inside: avoid !important;
-            }}
+            }
             
-            .performance-section {{
+            .performance-section {
                 page-break-inside: avoid !important;
-            }}
+            }
             
-            .section-title {{
+            .section-title {
                 page-break-after: avoid !important;
-            }}
+            }
             
-            .perf-grid {{
+            .perf-grid {
                 page-break-inside: avoid !important;
-            }}
+            }
             
-            .perf-item {{
+            .perf-item {
                 background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
                 page-break-inside: avoid !important;
-            }}
+            }
             
-            .perf-item.peak {{
+            .perf-item.peak {
                 background: linear-gradient(135deg, #48bb78 0%, #38a169 100%) !important;
-            }}
+            }
             
-            .temp-grid {{
+            .temp-grid {
                 page-break-inside: avoid !important;
-            }}
+            }
             
-            .status-passed {{
+            .status-passed {
                 background: #48bb78 !important;
-            }}
+            }
             
-            .status-badge {{
+            .status-badge {
                 page-break-inside: avoid !important;
-            }}
+            }
             
-            .footer {{
+            .footer {
                 box-shadow: none;
                 page-break-inside: avoid !important;
                 border: 1px solid #e2e8f0;
                 margin-top: 20px;
                 background: white !important;
-            }}
+            }
             
             /* Ensure enough space before starting a new section */
-            .drive-card:nth-child(n+2) {{
+            .drive-card:nth-child(n+2) {
                 margin-top: 30px;
-            }}
-        }}
+            }
+        }
     </style>
 </head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🚀 NVMe Stress Test Report</h1>
-            <p class="subtitle">Comprehensive drive performance and health analysis</p>
-            
-            <div class="summary-cards">
-                <div class="summary-card success">
-                    <h3>Total Drives Tested</h3>
-                    <div class="value">{total_count}</div>
-                </div>
-                <div class="summary-card success">
-                    <h3>Drives Passed</h3>
-                    <div class="value">{passed_count}</div>
-                </div>
-                <div class="summary-card info">
-                    <h3>PCIe Interface</h3>
-                    <div class="value" style="font-size: 1.5em;">{pcie_info}</div>
-                    <p style="font-size: 0.8em; margin-top: 5px; opacity: 0.9;">{pcie_speed}</p>
-                </div>
-                <div class="summary-card info">
-                    <h3>Test Type</h3>
-                    <div class="value" style="font-size: 1.3em;">AI + Peak</div>
-                </div>
-                <div class="summary-card info">
-                    <h3>Duration</h3>
-                    <div class="value" style="font-size: 1.5em;">3 hours</div>
-                </div>
-            </div>
-        </div>
 """
-    
-    # Add individual drive cards
-    for drive in sorted(drives_data, key=lambda x: x['drive_name']):
-        status_class = 'status-passed' if drive['health_status'] == 'PASSED' and drive['errors'] == 0 else 'status-failed'
-        status_text = 'PASSED ✓' if drive['health_status'] == 'PASSED' and drive['errors'] == 0 else 'CHECK'
-        
-        # Shorten model name if too long
-        model_display = drive['model']
-        if len(model_display) > 30:
-            model_display = model_display[:27] + "..."
-        
-        html += f"""
+
+
+# Per-drive card, filled from the parsed drive data plus display values
+_DRIVE_CARD = Template("""
         <div class="drive-card">
             <div class="drive-header">
-                <div class="drive-name">📦 {drive['drive_name'].upper()}</div>
-                <div class="status-badge {status_class}">{status_text}</div>
+                <div class="drive-name">📦 ${drive_label}</div>
+                <div class="status-badge ${status_class}">${status_text}</div>
             </div>
             
             <div class="specs-grid">
                 <div class="spec-item">
                     <div class="spec-label">Model</div>
-                    <div class="spec-value" title="{drive['model']}">{model_display}</div>
+                    <div class="spec-value" title="${model}">${model_display}</div>
                 </div>
                 <div class="spec-item">
                     <div class="spec-label">Serial Number</div>
-                    <div class="spec-value">{drive['serial']}</div>
+                    <div class="spec-value">${serial}</div>
                 </div>
                 <div class="spec-item">
                     <div class="spec-label">Capacity</div>
-                    <div class="spec-value">{drive['capacity']}</div>
+                    <div class="spec-value">${capacity}</div>
                 </div>
                 <div class="spec-item">
                     <div class="spec-label">Firmware</div>
-                    <div class="spec-value">{drive['firmware']}</div>
+                    <div class="spec-value">${firmware}</div>
                 </div>
                 <div class="spec-item">
                     <div class="spec-label">NVMe Version</div>
-                    <div class="spec-value">{drive['nvme_version']}</div>
+                    <div class="spec-value">${nvme_version}</div>
                 </div>
                 <div class="spec-item">
                     <div class="spec-label">Health Status</div>
-                    <div class="spec-value">{drive['health_status']}</div>
+                    <div class="spec-value">${health_status}</div>
                 </div>
                 <div class="spec-item">
                     <div class="spec-label">Percentage Used</div>
-                    <div class="spec-value">{drive['percentage_used']}%</div>
+                    <div class="spec-value">${percentage_used}%</div>
                 </div>
                 <div class="spec-item">
                     <div class="spec-label">Error Count</div>
-                    <div class="spec-value">{drive['errors']}</div>
+                    <div class="spec-value">${errors}</div>
                 </div>
             </div>
             
@@ -507,12 +525,12 @@ def generate_html_report_with_peak(drives_data, output_file):
                 <div class="perf-grid">
                     <div class="perf-item peak">
                         <h4>Peak Read Speed</h4>
-                        <div class="value">{drive.get('peak_read_bw', 'N/A')}</div>
+                        <div class="value">${peak_read}</div>
                         <div class="subtext">Sequential Read</div>
                     </div>
                     <div class="perf-item peak">
                         <h4>Peak Write Speed</h4>
-                        <div class="value">{drive.get('peak_write_bw', 'N/A')}</div>
+                        <div class="value">${peak_write}</div>
                         <div class="subtext">Sequential Write</div>
                     </div>
                 </div>
@@ -523,29 +541,29 @@ def generate_html_report_with_peak(drives_data, output_file):
                 <div class="perf-grid">
                     <div class="perf-item">
                         <h4>Read Bandwidth</h4>
-                        <div class="value">{drive['read_bw']}</div>
+                        <div class="value">${read_bw}</div>
                         <div class="subtext">Mixed Random/Seq</div>
                     </div>
                     <div class="perf-item">
                         <h4>Read IOPS</h4>
-                        <div class="value">{drive['read_iops']}</div>
+                        <div class="value">${read_iops}</div>
                     </div>
                     <div class="perf-item">
                         <h4>Write Bandwidth</h4>
-                        <div class="value">{drive['write_bw']}</div>
+                        <div class="value">${write_bw}</div>
                         <div class="subtext">Mixed Random/Seq</div>
                     </div>
                     <div class="perf-item">
                         <h4>Write IOPS</h4>
-                        <div class="value">{drive['write_iops']}</div>
+                        <div class="value">${write_iops}</div>
                     </div>
                     <div class="perf-item">
                         <h4>Data Read</h4>
-                        <div class="value">{drive['data_read']}</div>
+                        <div class="value">${data_read}</div>
                     </div>
                     <div class="perf-item">
                         <h4>Data Written</h4>
-                        <div class="value">{drive['data_written']}</div>
+                        <div class="value">${data_written}</div>
                     </div>
                 </div>
             </div>
@@ -555,36 +573,111 @@ def generate_html_report_with_peak(drives_data, output_file):
                 <div class="temp-grid">
                     <div class="temp-item">
                         <div class="label">Before Test</div>
-                        <div class="value">{drive['temp_before']}°C</div>
+                        <div class="value">${temp_before}°C</div>
                     </div>
                     <div class="temp-item">
                         <div class="label">After Test</div>
-                        <div class="value">{drive['temp_after']}°C</div>
+                        <div class="value">${temp_after}°C</div>
                     </div>
-"""
-        
-        # Add temperature sensors
-        for sensor_name, temp in drive['temp_sensors_after']:
-            html += f"""
+""")
+
+_TEMP_SENSOR = Template("""
                     <div class="temp-item">
-                        <div class="label">{sensor_name}</div>
-                        <div class="value">{temp}°C</div>
+                        <div class="label">Sensor ${num}</div>
+                        <div class="value">${temp}°C</div>
                     </div>
-"""
-        
-        html += """
+""")
+
+_DRIVE_CARD_END = """
                 </div>
             </div>
         </div>
 """
+
+
+def format_peak(peak_bw):
+    """Format a peak bandwidth in MiB/s for display"""
+    return f"{peak_bw} MiB/s" if peak_bw is not None else 'N/A'
+
+
+def generate_html_report_with_peak(drives_data, output_file):
+    """Generate HTML report with peak performance data"""
     
-    # Calculate average peak performance
-    avg_peak_read = sum(int(d.get('peak_read_bw', '0').split()[0]) for d in drives_data if d.get('peak_read_bw', 'N/A') != 'N/A') / max(sum(1 for d in drives_data if d.get('peak_read_bw', 'N/A') != 'N/A'), 1)
-    avg_peak_write = sum(int(d.get('peak_write_bw', '0').split()[0]) for d in drives_data if d.get('peak_write_bw', 'N/A') != 'N/A') / max(sum(1 for d in drives_data if d.get('peak_write_bw', 'N/A') != 'N/A'), 1)
+    passed_count = sum(1 for d in drives_data if d['health_status'] == 'PASSED' and d['errors'] == 0)
+    total_count = len(drives_data)
+    
+    pcie_info, pcie_speed = get_pcie_info()
     
-    # Add footer
-    current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    html += f"""
+    # Calculate average peak performance in a single pass
+    read_total = read_count = write_total = write_count = 0
+    for drive in drives_data:
+        if 'peak_read_bw' in drive:
+            read_total += drive['peak_read_bw']
+            read_count += 1
+        if 'peak_write_bw' in drive:
+            write_total += drive['peak_write_bw']
+            write_count += 1
+    avg_peak_read = read_total / max(read_count, 1)
+    avg_peak_write = write_total / max(write_count, 1)
+    
+    with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as out:
+        out.write(_HTML_HEAD)
+        out.write(f"""<body>
+    <div class="container">
+        <div class="header">
+            <h1>🚀 NVMe Stress Test Report</h1>
+            <p class="subtitle">Comprehensive drive performance and health analysis</p>
+            
+            <div class="summary-cards">
+                <div class="summary-card success">
+                    <h3>Total Drives Tested</h3>
+                    <div class="value">{total_count}</div>
+                </div>
+                <div class="summary-card success">
+                    <h3>Drives Passed</h3>
+                    <div class="value">{passed_count}</div>
+                </div>
+                <div class="summary-card info">
+                    <h3>PCIe Interface</h3>
+                    <div class="value" style="font-size: 1.5em;">{pcie_info}</div>
+                    <p style="font-size: 0.8em; margin-top: 5px; opacity: 0.9;">{pcie_speed}</p>
+                </div>
+                <div class="summary-card info">
+                    <h3>Test Type</h3>
+                    <div class="value" style="font-size: 1.3em;">AI + Peak</div>
+                </div>
+                <div class="summary-card info">
+                    <h3>Duration</h3>
+                    <div class="value" style="font-size: 1.5em;">3 hours</div>
+                </div>
+            </div>
+        </div>
+""")
+        
+        # Add individual drive cards (callers pass them sorted by drive name)
+        for drive in drives_data:
+            status_class = 'status-passed' if drive['health_status'] == 'PASSED' and drive['errors'] == 0 else 'status-failed'
+            status_text = 'PASSED ✓' if drive['health_status'] == 'PASSED' and drive['errors'] == 0 else 'CHECK'
+            
+            # Shorten model name if too long
+            model = drive['model']
+            model_display = model[:27] + "..." if len(model) > 30 else model
+            
+            out.write(_DRIVE_CARD.substitute(drive, drive_label=drive['drive_name'].upper(),
+                                             status_class=status_class, status_text=status_text,
+                                             model_display=model_display,
+                                             peak_read=format_peak(drive.get('peak_read_bw')),
+                                             peak_write=format_peak(drive.get('peak_write_bw'))))
+            
+            # Add temperature sensors in one write
+            out.write(''.join(_TEMP_SENSOR.substitute(num=num, temp=temp)
+                              for num, temp in drive['temp_sensors_after']))
+            
+            out.write(_DRIVE_CARD_END)
+        
+        # Add footer
+        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        out.write(f"""
         <div class="footer">
             <h3>Test Summary</h3>
             <p style="margin: 10px 0;"><strong>All drives successfully passed comprehensive stress testing.</strong></p>
@@ -598,17 +691,61 @@ def generate_html_report_with_peak(drives_data, output_file):
     </div>
 </body>
 </html>
-"""
+""")
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html)
+    # Precompressed copy for web servers that serve .gz siblings directly
+    with open(output_file, 'rb') as src, gzip.open(f"{output_file}.gz", 'wb', compresslevel=6) as gz:
+        shutil.copyfileobj(src, gz, 1 << 20)
     
     print(f"✅ Report updated successfully: {output_file}")
 
 
+def load_fio_cache(cache_file):
+    """Read the FIO bandwidth cache, empty if it is missing or unreadable"""
+    try:
+        with open(cache_file, 'rb') as f:
+            return json_loads(f.read())
+    except (OSError, ValueError):
+        return {}
+
+
+def cached_fio_bw(cache, entry):
+    """Peak bandwidth of a FIO JSON file, parsed only if it changed since it was cached"""
+    st = entry.stat()
+    stamp = [st.st_mtime_ns, st.st_size]
+    cached = cache.get(entry.name)
+    if cached and cached[:2] == stamp:
+        return cached[2]
+    
+    bw = parse_fio_json(entry.path)
+    cache[entry.name] = stamp + [bw]
+    return bw
+
+
+def process_log_file(log_file, peak_read, peak_write):
+    """Parse one drive's log and add its peak performance, if any (runs in a worker process)"""
+    print(f"Parsing {log_file.name}...")
+    parser = NVMeLogParser(log_file)
+    data = parser.parse()
+    
+    if peak_read:
+        data['peak_read_bw'] = peak_read
+        print(f"  Peak read: {peak_read} MiB/s")
+    
+    if peak_write:
+        data['peak_write_bw'] = peak_write
+        print(f"  Peak write: {peak_write} MiB/s")
+    
+    return data
+
+
 def main():
     log_dir = Path('/home/bizon/nvme_stress_test')
-    log_files = sorted(log_dir.glob('nvme*.log'))
+    
+    # List the directory once; file checks below are dict lookups
+    with os.scandir(log_dir) as it:
+        entries = {entry.name: entry for entry in it}
+    log_files = sorted(log_dir / name for name in entries if name.startswith('nvme') and name.endswith('.log'))
     
     if not log_files:
         print("No log files found!")
@@ -616,31 +753,27 @@ def main():
     
     print(f"Found {len(log_files)} log files")
     
-    # Parse all log files
-    drives_data = []
+    # Peak performance for each drive from its FIO JSON files; results are
+    # kept in a cache file beside the report, so re-runs only parse the
+    # files that changed
+    cache_file = log_dir / FIO_CACHE_NAME
+    fio_cache = load_fio_cache(cache_file)
+    peak_reads, peak_writes = [], []
     for log_file in log_files:
-        print(f"Parsing {log_file.name}...")
-        parser = NVMeLogParser(log_file)
-        data = parser.parse()
-        
-        # Check for peak performance JSON files
-        drive_name = log_file.stem
-        read_json = log_dir / f"{drive_name}_read.json"
-        write_json = log_dir / f"{drive_name}_write.json"
-        
-        if read_json.exists():
-            peak_read = parse_fio_json(read_json)
-            if peak_read:
-                data['peak_read_bw'] = f"{peak_read} MiB/s"
-                print(f"  Peak read: {peak_read} MiB/s")
-        
-        if write_json.exists():
-            peak_write = parse_fio_json(write_json)
-            if peak_write:
-                data['peak_write_bw'] = f"{peak_write} MiB/s"
-                print(f"  Peak write: {peak_write} MiB/s")
-        
-        drives_data.append(data)
+        read_entry = entries.get(f"{log_file.stem}_read.json")
+        write_entry = entries.get(f"{log_file.stem}_write.json")
+        peak_reads.append(cached_fio_bw(fio_cache, read_entry) if read_entry else None)
+        peak_writes.append(cached_fio_bw(fio_cache, write_entry) if write_entry else None)
+    try:
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump(fio_cache, f)
+    except OSError as e:
+        print(f"Could not write {cache_file}: {e}")
+    
+    # Parse all log files, one worker process per drive (up to the CPU count)
+    with ProcessPoolExecutor(max_workers=min(len(log_files), os.cpu_count() or 1)) as executor:
+        drives_data = list(executor.map(process_log_file, log_files, peak_reads, peak_writes))
+    drives_data.sort(key=itemgetter('drive_name'))
     
     # Generate HTML report with peak performance
     output_file = log_dir / 'nvme_stress_test_report.html'
@@ -4,31 +4,120 @@ NVMe Stress Test Web Application
 A web-based interface for running NVMe stress tests accessible from any browser
 """
 
-from flask import Flask, render_template, jsonify, request, send_file
+# Serve Socket.IO from eventlet's event loop when it is installed; it must
+# patch the standard library before Flask and subprocess are imported
+try:
+    import eventlet
+    eventlet.monkey_patch()
+    ASYNC_MODE = 'eventlet'
+except ImportError:
+    ASYNC_MODE = 'threading'
+
+from flask import Flask, Response, render_template, jsonify, request, send_file
+from flask.json.provider import DefaultJSONProvider
 from flask_socketio import SocketIO, emit
 import subprocess
+import hashlib
 import os
+import queue
+import re
+import selectors
+import socket
+import threading
 import time
 import json
-import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
+from operator import itemgetter
 from pathlib import Path
 import signal
 
+# Encode API responses with orjson when it is installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
 app.config['SECRET_KEY'] = 'nvme-stress-test-secret-2024'
-socketio = SocketIO(app, cors_allowed_origins="*")
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode=ASYNC_MODE)
 
 # Global variables
 active_tests = {}
 log_directory = Path(__file__).parent
 
+# Tests run as daemon background tasks (green threads under eventlet), so
+# they never hold up server exit; starts beyond the limit are refused
+MAX_CONCURRENT_TESTS = 8
+
+# Held for every insert into and removal from active_tests; plain lookups
+# go without it
+_tests_lock = threading.Lock()
+
+# Test output is sent to the clients once this many lines have accumulated,
+# or whatever has accumulated after this many seconds
+OUTPUT_BATCH_LINES = 16
+OUTPUT_BATCH_INTERVAL = 0.05
+
+# Events from test workers and request handlers, sent by emit_loop so
+# that only the server's own background task writes to the clients; the
+# loop is started by the first queued event, however the app is served
+_emit_queue = queue.Queue()
+_emit_loop_lock = threading.Lock()
+_emit_loop_started = False
+
+# The log viewer gets at most the last this many bytes of a log
+LOG_VIEW_MAX_BYTES = 1 << 20
+
+# Characters replaced with '_' in user-supplied log names
+LOG_NAME_UNSAFE = re.compile(r'[^\w-]')
+
+# SMART results per device path as (time.monotonic() timestamp, (health, text));
+# health changes over minutes, so page refreshes reuse recent results
+HEALTH_CACHE_TTL = 15.0
+SMART_CACHE_TTL = 5.0
+_smart_cache = {}
+
+# Detected devices as (time.monotonic() timestamp, devices, /sys/class/nvme mtime)
+DEVICES_CACHE_TTL = 2.0
+_devices_cache = (0.0, [], None)
+
+# Mounted sources from /proc/mounts as (time.monotonic() timestamp, set)
+MOUNTS_CACHE_TTL = 1.0
+_mounts_cache = (0.0, frozenset())
+
 
 def detect_nvme_devices():
-    """Detect all NVMe devices on the system"""
+    """Detect all NVMe devices on the system, reusing a recent scan until hotplug"""
+    global _devices_cache
+    # /sys/class/nvme changes when a controller is added or removed
     try:
+        sys_mtime = os.stat('/sys/class/nvme').st_mtime_ns
+    except OSError:
+        sys_mtime = None
+    scanned_at, devices, cached_mtime = _devices_cache
+    if sys_mtime == cached_mtime and time.monotonic() - scanned_at < DEVICES_CACHE_TTL:
+        return [dict(device) for device in devices]
+    
+    try:
+        # -b reports sizes in bytes; the client formats them
         result = subprocess.run(
-            ["lsblk", "-d", "-o", "NAME,SIZE,MODEL", "-J"],
+            ["lsblk", "-d", "-b", "-o", "NAME,SIZE,MODEL", "-J"],
             capture_output=True,
             text=True,
             timeout=5
@@ -43,118 +132,260 @@ def detect_nvme_devices():
         for device in data.get('blockdevices', []):
             name = device.get('name', '')
             if 'nvme' in name:
+                size = device.get('size')
                 devices.append({
                     'name': name,
-                    'size': device.get('size', 'Unknown'),
+                    'size': int(size) if size is not None else 'Unknown',
                     'model': device.get('model', 'Unknown'),
                     'path': f"/dev/{name}"
                 })
         
-        return devices
+        _devices_cache = (time.monotonic(), devices, sys_mtime)
+        return [dict(device) for device in devices]
     except Exception as e:
         print(f"Error detecting NVMe devices: {e}")
         return []
 
 
+def get_device_smart(device_path, max_age):
+    """Get (health, full SMART text) for a device, reusing a read up to max_age seconds old"""
+    cached = _smart_cache.get(device_path)
+    if cached and time.monotonic() - cached[0] < max_age:
+        return cached[1]
+    
+    smart = read_device_smart(device_path)
+    _smart_cache[device_path] = (time.monotonic(), smart)
+    return smart
+
+
 def get_device_health(device_path):
-    """Get SMART health status for a device"""
+    """Get SMART health status for a device, cached for HEALTH_CACHE_TTL seconds"""
+    return get_device_smart(device_path, HEALTH_CACHE_TTL)[0]
+
+
+def get_device_smart_data(device_path):
+    """Get full SMART data for a device, cached for SMART_CACHE_TTL seconds"""
+    return get_device_smart(device_path, SMART_CACHE_TTL)[1]
+
+
+def read_device_smart(device_path):
+    """Read SMART health and full SMART text for a device with one smartctl call"""
     try:
+        # JSON output, with the usual text report included as smartctl.output
         result = subprocess.run(
-            ["sudo", "smartctl", "-H", device_path],
+            ["sudo", "smartctl", "-H", "-a", "--json=o", device_path],
             capture_output=True,
             text=True,
-            timeout=5
+            timeout=10
         )
-        
-        output = result.stdout.lower() + result.stderr.lower()
-        if "overall-health self-assessment test result: passed" in output or "health status: ok" in output:
-            return {"status": "Healthy", "color": "success"}
-        elif "overall-health self-assessment test result: failed" in output:
-            return {"status": "Failed", "color": "danger"}
-        else:
-            return {"status": "Unknown", "color": "warning"}
     except Exception as e:
-        return {"status": "Error", "color": "danger"}
+        return {"status": "Error", "color": "danger"}, f"Error getting SMART data: {str(e)}"
+    
+    try:
+        data = json.loads(result.stdout)
+    except ValueError:
+        data = None
+    if not isinstance(data, dict) or 'smartctl' not in data:
+        # smartctl before 7.0 rejects --json; fall back to its text report
+        return read_device_smart_text(device_path)
+    
+    passed = data.get('smart_status', {}).get('passed')
+    if passed is True:
+        health = {"status": "Healthy", "color": "success"}
+    elif passed is False:
+        health = {"status": "Failed", "color": "danger"}
+    else:
+        health = {"status": "Unknown", "color": "warning"}
+    
+    output = data.get('smartctl', {}).get('output')
+    return health, '\n'.join(output) if output else result.stdout
 
 
-def get_device_smart_data(device_path):
-    """Get full SMART data for a device"""
+def read_device_smart_text(device_path):
+    """Read SMART health and text by parsing plain smartctl output"""
     try:
         result = subprocess.run(
-            ["sudo", "smartctl", "-a", device_path],
+            ["sudo", "smartctl", "-H", "-a", device_path],
             capture_output=True,
             text=True,
             timeout=10
         )
-        return result.stdout if result.stdout else result.stderr
     except Exception as e:
-        return f"Error getting SMART data: {str(e)}"
+        return {"status": "Error", "color": "danger"}, f"Error getting SMART data: {str(e)}"
+    
+    output = result.stdout.lower() + result.stderr.lower()
+    if "overall-health self-assessment test result: passed" in output or "health status: ok" in output:
+        health = {"status": "Healthy", "color": "success"}
+    elif "overall-health self-assessment test result: failed" in output:
+        health = {"status": "Failed", "color": "danger"}
+    else:
+        health = {"status": "Unknown", "color": "warning"}
+    return health, result.stdout if result.stdout else result.stderr
+
 
+def invalidate_device_cache(device_path):
+    """Drop cached SMART results for a device so the next request rereads them"""
+    _smart_cache.pop(device_path, None)
 
-def check_if_mounted(device_name):
-    """Check if device is mounted"""
+
+def read_mounts(max_age=MOUNTS_CACHE_TTL):
+    """Get the set of mounted sources from /proc/mounts, reusing a read up to max_age seconds old"""
+    global _mounts_cache
+    read_at, mounts = _mounts_cache
+    if time.monotonic() - read_at < max_age:
+        return mounts
+    
     try:
         with open('/proc/mounts', 'r') as f:
-            mounts = f.read()
-            return f"/dev/{device_name}" in mounts
+            mounts = frozenset(line.split(maxsplit=1)[0] for line in f)
     except Exception:
-        return False
+        return frozenset()
+    _mounts_cache = (time.monotonic(), mounts)
+    return mounts
 
 
-def run_stress_test(test_id, device_path, duration, workload_type, log_file):
-    """Run the stress test in a background thread"""
-    script_path = log_directory / "run_single_drive_test.sh"
-    
-    if not script_path.exists():
-        socketio.emit('test_error', {
+def get_mounted_partitions(device_path, mounts):
+    """Get the mounted sources that are the device or one of its partitions"""
+    # nvme0n1 -> nvme0n1p1, sda -> sda1
+    part_prefix = device_path + 'p' if device_path[-1].isdigit() else device_path
+    return [source for source in mounts
+            if source == device_path or (source.startswith(part_prefix) and source[len(part_prefix):].isdigit())]
+
+
+def check_if_mounted(device_name, mounts):
+    """Check if device or any of its partitions is mounted"""
+    return bool(get_mounted_partitions(f"/dev/{device_name}", mounts))
+
+
+def probe_device(device, mounts):
+    """Add health and mount status to a detected device"""
+    device['health'] = get_device_health(device['path'])
+    device['mounted'] = check_if_mounted(device['name'], mounts)
+
+
+def read_log_tail(log_file, max_bytes):
+    """Read up to the last max_bytes bytes of a file; returns (file size, bytes)"""
+    fd = os.open(log_file, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        start = max(0, size - max(0, max_bytes))
+        return size, os.pread(fd, size - start, start)
+    finally:
+        os.close(fd)
+
+
+def report_fingerprint():
+    """Fingerprint the report inputs by name, mtime and size of every log and FIO JSON file"""
+    # Dotfiles such as the report script's .fio_cache.json are its own output
+    with os.scandir(log_directory) as it:
+        inputs = sorted((entry.name, entry.stat().st_mtime_ns, entry.stat().st_size) for entry in it
+                        if entry.name.endswith(('.log', '.json')) and not entry.name.startswith('.')
+                        and entry.is_file())
+    return hashlib.sha1(repr(inputs).encode()).hexdigest()
+
+
+def queue_emit(event, data):
+    """Queue a Socket.IO event for emit_loop to send, starting the loop on first use"""
+    global _emit_loop_started
+    if not _emit_loop_started:
+        with _emit_loop_lock:
+            if not _emit_loop_started:
+                socketio.start_background_task(emit_loop)
+                _emit_loop_started = True
+    _emit_queue.put((event, data))
+
+
+def emit_loop():
+    """Send queued events to the clients, in order, from a server background task"""
+    while True:
+        event, data = _emit_queue.get()
+        socketio.emit(event, data)
+        socketio.sleep(0)
+
+
+def emit_output(test_id, lines):
+    """Send a batch of test output lines to the clients"""
+    if lines:
+        queue_emit('test_output', {
             'test_id': test_id,
-            'message': f"Test script not found at {script_path}"
+            'lines': lines
         })
-        return
-    
-    command = f'"{script_path}" "{device_path}" {duration} "{log_file}" "{workload_type}"'
-    
+
+
+def run_stress_test(test_id, device_path, duration, workload_type, log_file):
+    """Run the stress test in a background thread"""
+    test = active_tests[test_id]
     try:
+        script_path = log_directory / "run_single_drive_test.sh"
+        
+        if not script_path.exists():
+            queue_emit('test_error', {
+                'test_id': test_id,
+                'message': f"Test script not found at {script_path}"
+            })
+            return
+        
+        command = [str(script_path), device_path, str(duration), log_file, workload_type]
+        
         process = subprocess.Popen(
             command,
             stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            shell=True,
-            text=True,
-            bufsize=1,
-            universal_newlines=True
+            stderr=subprocess.STDOUT
         )
         
-        active_tests[test_id]['process'] = process
-        active_tests[test_id]['start_time'] = time.time()
+        test['process'] = process
+        test['start_time'] = time.time()
         
-        # Stream output line by line
-        for line in iter(process.stdout.readline, ""):
-            if line:
-                socketio.emit('test_output', {
-                    'test_id': test_id,
-                    'line': line.strip()
-                })
+        # Drain output without blocking so a stop request is seen promptly;
+        # lines go out in batches, flushed when full or stale
+        fd = process.stdout.fileno()
+        os.set_blocking(fd, False)
+        batch = []
+        leftover = b''
+        last_flush = time.monotonic()
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while not test.get('stopped'):
+                if selector.select(timeout=OUTPUT_BATCH_INTERVAL):
+                    chunk = os.read(fd, 65536)
+                    if not chunk:
+                        break
+                    lines = (leftover + chunk).split(b'\n')
+                    leftover = lines.pop()
+                    batch.extend(line.decode('utf-8', errors='replace').strip() for line in lines)
+                now = time.monotonic()
+                if len(batch) >= OUTPUT_BATCH_LINES or now - last_flush > OUTPUT_BATCH_INTERVAL:
+                    emit_output(test_id, batch)
+                    batch = []
+                    last_flush = now
+        if leftover:
+            batch.append(leftover.decode('utf-8', errors='replace').strip())
+        emit_output(test_id, batch)
         
         return_code = process.wait()
+        invalidate_device_cache(device_path)
+        
+        # A stopped test has already been reported by api_test_stop
+        if test.get('stopped'):
+            return
         
         # Test finished
-        socketio.emit('test_finished', {
+        queue_emit('test_finished', {
             'test_id': test_id,
             'success': return_code == 0,
             'message': f"Test completed {'successfully' if return_code == 0 else 'with errors'}"
         })
-        
-        if test_id in active_tests:
-            del active_tests[test_id]
             
     except Exception as e:
-        socketio.emit('test_error', {
+        queue_emit('test_error', {
             'test_id': test_id,
             'message': str(e)
         })
-        if test_id in active_tests:
-            del active_tests[test_id]
+    finally:
+        # Free the slot on every exit; api_test_stop removes the tests it stops
+        if not test.get('stopped'):
+            with _tests_lock:
+                active_tests.pop(test_id, None)
 
 
 @app.route('/')
@@ -168,10 +399,10 @@ def api_devices():
     """Get list of NVMe devices"""
     devices = detect_nvme_devices()
     
-    # Add health and mount status
-    for device in devices:
-        device['health'] = get_device_health(device['path'])
-        device['mounted'] = check_if_mounted(device['name'])
+    # Add health and mount status, probing the devices concurrently
+    if devices:
+        with ThreadPoolExecutor(max_workers=min(16, len(devices))) as executor:
+            list(executor.map(partial(probe_device, mounts=read_mounts()), devices))
     
     return jsonify(devices)
 
@@ -200,18 +431,13 @@ def api_test_start():
     
     # Check if device is mounted
     device_name = device_path.split('/')[-1]
-    if check_if_mounted(device_name):
+    mounts = read_mounts(max_age=0)
+    if check_if_mounted(device_name, mounts):
         if auto_unmount:
             try:
                 # Unmount all partitions
-                result = subprocess.run(
-                    f"grep '{device_path}' /proc/mounts | awk '{{print $1}}'",
-                    shell=True, capture_output=True, text=True
-                )
-                mounted_parts = result.stdout.strip().split('\n')
-                for part in mounted_parts:
-                    if part:
-                        subprocess.run(['sudo', 'umount', part], check=True)
+                for part in get_mounted_partitions(device_path, mounts):
+                    subprocess.run(['sudo', 'umount', part], check=True)
             except subprocess.CalledProcessError:
                 return jsonify({'error': 'Failed to unmount device'}), 500
         else:
@@ -222,30 +448,31 @@ def api_test_start():
     
     if log_name:
         # Sanitize log name - keep only alphanumeric, underscores, and dashes
-        log_name = ''.join(c if c.isalnum() or c in '_-' else '_' for c in log_name)
+        log_name = LOG_NAME_UNSAFE.sub('_', log_name)
         log_file = log_directory / f"{log_name}.log"
     else:
         log_file = log_directory / f"nvme_stress_{device_name}_{timestamp}.log"
     
     # Create test ID
     test_id = f"test_{timestamp}_{device_name}"
+    invalidate_device_cache(device_path)
+    
+    # Store test info, checking the limit and inserting under one lock
+    with _tests_lock:
+        if len(active_tests) >= MAX_CONCURRENT_TESTS:
+            return jsonify({'error': f'Too many tests running (limit {MAX_CONCURRENT_TESTS})'}), 429
+        active_tests[test_id] = {
+            'device': device_path,
+            'duration': duration,
+            'log_file': str(log_file),
+            'start_time': time.time(),
+            'workload_type': workload_type
+        }
     
-    # Store test info
-    active_tests[test_id] = {
-        'device': device_path,
-        'duration': duration,
-        'log_file': str(log_file),
-        'start_time': time.time(),
-        'workload_type': workload_type
-    }
-    
-    # Start test in background thread
-    thread = threading.Thread(
-        target=run_stress_test,
-        args=(test_id, device_path, duration, workload_type, str(log_file))
+    # Start test as a background task of the Socket.IO server
+    socketio.start_background_task(
+        run_stress_test, test_id, device_path, duration, workload_type, str(log_file)
     )
-    thread.daemon = True
-    thread.start()
     
     return jsonify({
         'test_id': test_id,
@@ -256,10 +483,16 @@ def api_test_start():
 @app.route('/api/test/<test_id>/stop', methods=['POST'])
 def api_test_stop(test_id):
     """Stop a running test"""
-    if test_id not in active_tests:
-        return jsonify({'error': 'Test not found'}), 404
+    # Claim the test under the lock; the process is stopped outside it
+    with _tests_lock:
+        test = active_tests.get(test_id)
+        if test is None:
+            return jsonify({'error': 'Test not found'}), 404
+        process = test.get('process')
+        if process:
+            test['stopped'] = True
     
-    process = active_tests[test_id].get('process')
+    invalidate_device_cache(test['device'])
     if process:
         try:
             process.terminate()
@@ -267,16 +500,18 @@ def api_test_stop(test_id):
             if process.poll() is None:
                 process.kill()
             
-            socketio.emit('test_finished', {
+            queue_emit('test_finished', {
                 'test_id': test_id,
                 'success': False,
                 'message': 'Test was stopped by user'
             })
-            
-            del active_tests[test_id]
             return jsonify({'success': True})
         except Exception as e:
             return jsonify({'error': str(e)}), 500
+        finally:
+            # The worker leaves stopped tests to us, so free the slot on any outcome
+            with _tests_lock:
+                active_tests.pop(test_id, None)
     
     return jsonify({'error': 'Process not found'}), 404
 
@@ -284,10 +519,10 @@ def api_test_stop(test_id):
 @app.route('/api/test/<test_id>/status')
 def api_test_status(test_id):
     """Get status of a running test"""
-    if test_id not in active_tests:
+    test_info = active_tests.get(test_id)
+    if test_info is None:
         return jsonify({'running': False})
     
-    test_info = active_tests[test_id]
     elapsed = time.time() - test_info['start_time']
     duration = test_info['duration']
     progress = min(int((elapsed / duration) * 100), 100)
@@ -305,31 +540,48 @@ def api_test_status(test_id):
 @app.route('/api/logs')
 def api_logs():
     """Get list of log files"""
-    logs = []
-    for log_file in log_directory.glob('*.log'):
-        stat = log_file.stat()
-        logs.append({
-            'name': log_file.name,
-            'size': stat.st_size,
-            'modified': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
-        })
+    # One directory pass; DirEntry.stat() is a single syscall per file
+    entries = []
+    with os.scandir(log_directory) as it:
+        for entry in it:
+            if entry.name.endswith('.log') and entry.is_file(follow_symlinks=False):
+                entries.append((entry.stat().st_mtime, entry))
     
-    logs.sort(key=lambda x: x['modified'], reverse=True)
+    entries.sort(key=itemgetter(0), reverse=True)
+    logs = [{
+        'name': entry.name,
+        'size': entry.stat().st_size,
+        'modified': datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M:%S')
+    } for mtime, entry in entries]
     return jsonify(logs)
 
 
 @app.route('/api/log/<log_name>')
 def api_log_content(log_name):
-    """Get content of a log file"""
+    """Get content of a log file as text, cut to the last ?max_bytes bytes, or with ?tail=N the last N bytes as JSON"""
     log_file = log_directory / log_name
     
     if not log_file.exists() or not log_file.is_file():
         return jsonify({'error': 'Log file not found'}), 404
     
+    tail = request.args.get('tail', type=int)
+    max_bytes = request.args.get('max_bytes', LOG_VIEW_MAX_BYTES, type=int)
+    if (tail is not None and tail <= 0) or max_bytes <= 0:
+        return jsonify({'error': 'tail and max_bytes must be positive'}), 400
+    
     try:
-        with open(log_file, 'r') as f:
-            content = f.read()
-        return jsonify({'content': content})
+        if tail is not None:
+            _, content = read_log_tail(log_file, tail)
+            return jsonify({'content': content.decode('utf-8', errors='replace')})
+        
+        if log_file.stat().st_size > max_bytes:
+            size, content = read_log_tail(log_file, max_bytes)
+            if size > max_bytes:
+                return Response('...[truncated]\n' + content.decode('utf-8', errors='replace'),
+                                mimetype='text/plain')
+        
+        # Range requests are honored and the body is sent straight from the file
+        return send_file(log_file, mimetype='text/plain', conditional=True)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -357,6 +609,18 @@ def api_report_generate():
         if not script_path.exists():
             return jsonify({'error': 'Report generator not found'}), 404
         
+        # Nothing to do if no log or FIO result changed since the last run
+        report_file = log_directory / "nvme_stress_test_report.html"
+        fingerprint_file = log_directory / ".report.fp"
+        fingerprint = report_fingerprint()
+        if (report_file.exists() and fingerprint_file.exists()
+                and fingerprint_file.read_text() == fingerprint):
+            return jsonify({
+                'success': True,
+                'report_url': '/report',
+                'message': 'Report is up to date'
+            })
+        
         result = subprocess.run(
             ['python3', str(script_path)],
             cwd=str(log_directory),
@@ -365,9 +629,9 @@ def api_report_generate():
             timeout=30
         )
         
-        report_file = log_directory / "nvme_stress_test_report.html"
-        
         if report_file.exists():
+            if result.returncode == 0:
+                fingerprint_file.write_text(fingerprint)
             return jsonify({
                 'success': True,
                 'report_url': '/report',
@@ -392,7 +656,9 @@ def view_report():
     if not report_file.exists():
         return "Report not found. Please generate a report first.", 404
     
-    return send_file(report_file)
+    # The report only changes when regenerated; let browsers revalidate
+    # with ETag/Last-Modified and get a 304
+    return send_file(report_file, conditional=True, etag=True, max_age=5)
 
 
 @socketio.on('connect')
@@ -410,13 +676,12 @@ def handle_disconnect():
 def get_local_ip():
     """Get the local IP address"""
     try:
-        result = subprocess.run(
-            ["hostname", "-I"],
-            capture_output=True,
-            text=True
-        )
-        return result.stdout.split()[0]
-    except:
+        # Connecting a UDP socket sends nothing; the kernel only picks the
+        # outgoing interface, whose address is the one to advertise
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(('10.255.255.255', 1))
+            return s.getsockname()[0]
+    except OSError:
         return "localhost"
 
 